@@ -0,0 +1,78 @@
+import os
+from typing import List, NamedTuple
+
+ENV_VAR_PREFIX = "CONFIGUE_BENCHMARK_VAR_"
+CONSTRUCTOR_PATH = "types.SimpleNamespace"
+
+
+class ConfigShape(NamedTuple):
+    """Shape of a generated configuration."""
+
+    # Number of keys of each mapping
+    width: int = 10
+    # Number of nested mappings between the root of a file and its values
+    depth: int = 3
+    # Number of files imported by the root file, each one with the same width and depth as the root file
+    imports: int = 0
+    # Proportion of the values containing an environment variable
+    env_ratio: float = 0.0
+    # Number of objects instantiated with ()
+    constructors: int = 0
+
+
+def generate_config(directory: str, shape: ConfigShape) -> str:
+    """Write a configuration with the given shape in a directory.
+
+    :return: the path of the root file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    root_lines = _generate_mapping_lines(shape, shape.depth, 0, "value")
+    for import_index in range(shape.imports):
+        import_file_name = f"imported_{import_index}.yml"
+        with open(os.path.join(directory, import_file_name), "w", encoding="utf-8") as import_file:
+            import_file.write("\n".join(_generate_mapping_lines(shape, shape.depth, 0, f"imported_{import_index}")))
+        root_lines.append(f"import_{import_index}: !import {import_file_name}")
+    if shape.constructors:
+        root_lines.append("objects:")
+        for object_index in range(shape.constructors):
+            root_lines.extend(
+                [
+                    f"  object_{object_index}:",
+                    f"    (): {CONSTRUCTOR_PATH}",
+                    f"    name: object_{object_index}",
+                    f"    index: {object_index}",
+                ]
+            )
+    root_path = os.path.join(directory, "config.yml")
+    with open(root_path, "w", encoding="utf-8") as root_file:
+        root_file.write("\n".join(root_lines))
+    return root_path
+
+
+def get_env_vars(shape: ConfigShape) -> List[str]:
+    """Return the names of the environment variables used by a generated configuration."""
+    return [f"{ENV_VAR_PREFIX}{index}" for index in range(shape.width)] if shape.env_ratio else []
+
+
+def get_value_paths(shape: ConfigShape) -> List[List[str]]:
+    """Return the paths of the values of the root file of a generated configuration."""
+    paths: List[List[str]] = [[]]
+    for _ in range(shape.depth):
+        paths = [path + [f"key_{key_index}"] for path in paths for key_index in range(shape.width)]
+    return paths
+
+
+def _generate_mapping_lines(shape: ConfigShape, depth: int, indent: int, value_prefix: str) -> List[str]:
+    lines = []
+    # The environment variables are spread evenly among the values
+    env_period = round(1 / shape.env_ratio) if shape.env_ratio else 0
+    for key_index in range(shape.width):
+        key = f"{' ' * indent}key_{key_index}:"
+        if depth > 1:
+            lines.append(key)
+            lines.extend(_generate_mapping_lines(shape, depth - 1, indent + 2, f"{value_prefix}_{key_index}"))
+        elif env_period and not key_index % env_period:
+            lines.append(f"{key} ${{{ENV_VAR_PREFIX}{key_index}}}")
+        else:
+            lines.append(f"{key} {value_prefix}_{key_index}")
+    return lines
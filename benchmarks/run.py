@@ -0,0 +1,163 @@
+"""Measure the time and the peak memory of each phase of the loading of generated configurations.
+
+Usage: python -m benchmarks.run [--repeat 10] [--backend python] [--save results.json] [--compare results.json]
+[scenario ...]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, cast
+
+from yaml import Node, ScalarNode
+
+import configue
+from configue.configue_loader import PYTHON_BACKEND
+from configue.file_loader import FileLoader
+from configue.nodes import iter_nodes
+from configue.root_loader import RootLoader
+
+from .generator import ConfigShape, generate_config, get_env_vars, get_value_paths
+
+SCENARIOS: Dict[str, ConfigShape] = {
+    "wide": ConfigShape(width=2000, depth=1),
+    "deep": ConfigShape(width=2, depth=11),
+    "balanced": ConfigShape(width=12, depth=3),
+    "env_vars": ConfigShape(width=12, depth=3, env_ratio=0.5),
+    "imports": ConfigShape(width=6, depth=2, imports=50),
+    "constructors": ConfigShape(width=1, depth=1, constructors=500),
+}
+
+
+class PhaseResult(NamedTuple):
+    scenario: str
+    phase: str
+    # Median duration of a run, in seconds
+    duration: float
+    # Peak of the memory allocated during a run, in bytes
+    peak_memory: int
+
+
+class Phase(NamedTuple):
+    name: str
+    # Prepare the state of a run, its duration is not measured
+    setup: Callable[[], Any]
+    # Run the phase on the state returned by setup
+    run: Callable[[Any], Any]
+
+
+def get_phases(file_path: str, shape: ConfigShape, backend: str) -> List[Phase]:
+    def create_root_loader() -> RootLoader:
+        return RootLoader(file_path, backend=backend)
+
+    def create_file_loader(_: Any = None) -> FileLoader:
+        return FileLoader(file_path, create_root_loader())
+
+    def create_composed_file_loader() -> FileLoader:
+        file_loader = create_file_loader()
+        _ = file_loader.root_node
+        return file_loader
+
+    def walk_value_paths(file_loader: FileLoader) -> None:
+        for value_path in value_paths:
+            file_loader._walk_nodes(root_node, value_path)  # pylint: disable=protected-access
+
+    def interpolate_env_vars(file_loader: FileLoader) -> None:
+        # Only the scalars are constructed, without instantiating the objects containing them
+        loader = file_loader._loader  # pylint: disable=protected-access
+        for env_node in env_nodes:
+            loader.construct_scalar(env_node)
+
+    value_paths = get_value_paths(shape)
+    root_node = cast(Node, create_composed_file_loader().root_node)
+    env_nodes = [node for node in iter_nodes(root_node) if isinstance(node, ScalarNode) and "${" in node.value]
+    return [
+        Phase("init", lambda: None, create_file_loader),
+        Phase("parse", create_file_loader, lambda file_loader: file_loader.root_node),
+        Phase("lookup", create_file_loader, walk_value_paths),
+        Phase("interpolate", create_file_loader, interpolate_env_vars),
+        Phase("construct", create_composed_file_loader, lambda file_loader: file_loader.load("")),
+        Phase("load", lambda: None, lambda _: configue.load(file_path, backend=backend)),
+    ]
+
+
+def measure(phase: Phase, repeat: int) -> PhaseResult:
+    durations = []
+    for _ in range(repeat):
+        state = phase.setup()
+        start_time = time.perf_counter()
+        phase.run(state)
+        durations.append(time.perf_counter() - start_time)
+    # The memory is measured separately, as tracing the allocations slows down the run
+    state = phase.setup()
+    tracemalloc.start()
+    try:
+        phase.run(state)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return PhaseResult("", phase.name, statistics.median(durations), peak_memory)
+
+
+def run_benchmarks(scenarios: Dict[str, ConfigShape], repeat: int, backend: str = PYTHON_BACKEND) -> List[PhaseResult]:
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for scenario, shape in scenarios.items():
+            file_path = generate_config(os.path.join(temp_dir, scenario), shape)
+            previous_env = {env_var: os.environ.get(env_var) for env_var in get_env_vars(shape)}
+            os.environ.update({env_var: "env_value" for env_var in previous_env})
+            try:
+                for phase in get_phases(file_path, shape, backend):
+                    results.append(measure(phase, repeat)._replace(scenario=scenario))
+            finally:
+                for env_var, value in previous_env.items():
+                    if value is None:
+                        os.environ.pop(env_var)
+                    else:
+                        os.environ[env_var] = value
+    return results
+
+
+def format_results(results: List[PhaseResult], baseline: Optional[List[PhaseResult]] = None) -> str:
+    baseline_durations = {(result.scenario, result.phase): result.duration for result in baseline or []}
+    lines = [f"{'scenario':<14}{'phase':<13}{'time (ms)':>12}{'peak (KiB)':>12}{'vs baseline':>13}"]
+    for result in results:
+        baseline_duration = baseline_durations.get((result.scenario, result.phase))
+        comparison = f"{result.duration / baseline_duration:>12.2f}x" if baseline_duration else ""
+        lines.append(
+            f"{result.scenario:<14}{result.phase:<13}{result.duration * 1000:>12.3f}"
+            f"{result.peak_memory / 1024:>12.1f}{comparison}"
+        )
+    return "\n".join(lines)
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run among {', '.join(SCENARIOS)}, all by default")
+    parser.add_argument("--repeat", type=int, default=10, help="number of runs of each phase")
+    parser.add_argument("--backend", default=PYTHON_BACKEND, help="parser backend")
+    parser.add_argument("--save", help="save the results in this JSON file")
+    parser.add_argument("--compare", help="compare the results with the ones saved in this JSON file")
+    parsed_arguments = parser.parse_args(arguments)
+    unknown_scenarios = set(parsed_arguments.scenarios) - set(SCENARIOS)
+    if unknown_scenarios:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown_scenarios))}")
+
+    scenarios = {scenario: SCENARIOS[scenario] for scenario in parsed_arguments.scenarios or SCENARIOS}
+    results = run_benchmarks(scenarios, parsed_arguments.repeat, parsed_arguments.backend)
+    baseline = None
+    if parsed_arguments.compare:
+        with open(parsed_arguments.compare, encoding="utf-8") as baseline_file:
+            baseline = [PhaseResult(**result) for result in json.load(baseline_file)]
+    print(format_results(results, baseline))
+    if parsed_arguments.save:
+        with open(parsed_arguments.save, "w", encoding="utf-8") as results_file:
+            json.dump([result._asdict() for result in results], results_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,6 @@
-from .utils import load
+from .async_config import AsyncConfig, aload
+from .config import Config
+from .preloaded import PreloadedConfig
+from .profiler import LoadProfiler
+from .utils import clear_cache, load, load_all, load_many
+from .watcher import ConfigWatcher
@@ -0,0 +1,143 @@
+"""Inspect configuration files from the command line.
+
+Usage:
+python -m configue resolve config.yml [sub.path] [--indent 2]
+python -m configue precompile config_dir --cache-dir .configue_cache
+python -m configue imports config.yml
+python -m configue timings config.yml [sub.path] [--max-lines 10]
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, List, Optional
+
+from .configue_loader import C_BACKEND, PYTHON_BACKEND
+from .disk_node_cache import DiskNodeCache
+from .profiler import LoadProfiler
+from .root_loader import RootLoader
+from .utils import load
+
+YAML_EXTENSIONS = (".yml", ".yaml")
+
+
+def resolve(arguments: argparse.Namespace) -> int:
+    """Print the value loaded from a sub path as JSON, the objects that cannot be converted are printed with repr."""
+    value = load(
+        arguments.file_path,
+        arguments.sub_path,
+        backend=arguments.backend,
+        cache_dir=arguments.cache_dir,
+        prefetch_imports=arguments.prefetch_imports,
+    )
+    print(json.dumps(value, indent=arguments.indent, default=repr, ensure_ascii=False))
+    return 0
+
+
+def precompile(arguments: argparse.Namespace) -> int:
+    """Store a snapshot of each YAML file of a directory in the cache directory used with the cache_dir parameter."""
+    disk_node_cache = DiskNodeCache(arguments.cache_dir)
+    exit_code = 0
+    for file_path in _find_yaml_files(arguments.directory):
+        try:
+            RootLoader(file_path, backend=arguments.backend, disk_node_cache=disk_node_cache).get_node(file_path, "")
+            print(file_path)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            print(f"Could not parse {file_path}: {error}", file=sys.stderr)
+            exit_code = 1
+    return exit_code
+
+
+def list_imports(arguments: argparse.Namespace) -> int:
+    """Print the paths of the files imported by a file, directly or not.
+
+    The paths depending on environment variables use their current values, the missing files are reported.
+    """
+    root_loader = RootLoader(arguments.file_path, backend=arguments.backend)
+    file_path = os.path.normpath(arguments.file_path)
+    visited_files = {file_path}
+    files_to_visit = [file_path]
+    exit_code = 0
+    while files_to_visit:
+        current_file_path = files_to_visit.pop()
+        if not os.path.isfile(current_file_path):
+            print(f"Could not find {current_file_path}", file=sys.stderr)
+            exit_code = 1
+            continue
+        root_node = root_loader.get_node(current_file_path, "")
+        if root_node is None:
+            continue
+        for imported_file in root_node[0].get_import_paths():
+            imported_file = os.path.normpath(imported_file)
+            if imported_file not in visited_files:
+                visited_files.add(imported_file)
+                files_to_visit.append(imported_file)
+    for imported_file in sorted(visited_files - {file_path}):
+        print(imported_file)
+    return exit_code
+
+
+def print_timings(arguments: argparse.Namespace) -> int:
+    """Load a sub path and print the number and the duration of the operations of each phase of the loading."""
+    profiler = LoadProfiler()
+    load(
+        arguments.file_path,
+        arguments.sub_path,
+        backend=arguments.backend,
+        cache_dir=arguments.cache_dir,
+        prefetch_imports=arguments.prefetch_imports,
+        profiler=profiler,
+    )
+    print(profiler.format_report(arguments.max_lines))
+    return 0
+
+
+def _find_yaml_files(directory: str) -> List[str]:
+    yaml_files: List[str] = []
+    for current_directory, directory_names, file_names in os.walk(directory):
+        directory_names.sort()
+        yaml_files.extend(
+            os.path.join(current_directory, file_name)
+            for file_name in sorted(file_names)
+            if file_name.endswith(YAML_EXTENSIONS)
+        )
+    return yaml_files
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m configue", description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(required=True)
+
+    def add_parser(name: str, command: Any, *, with_sub_path: bool = False) -> argparse.ArgumentParser:
+        subparser = subparsers.add_parser(name, help=command.__doc__.splitlines()[0], description=command.__doc__)
+        subparser.set_defaults(command=command)
+        if with_sub_path:
+            subparser.add_argument("file_path", help="path of the YAML file")
+            subparser.add_argument(
+                "sub_path", nargs="?", default="", help="sub path to load, the whole file by default"
+            )
+            subparser.add_argument("--cache-dir", help="directory of the snapshots of the parsed files")
+            subparser.add_argument(
+                "--prefetch-imports", action="store_true", help="parse the imported files in a pool of threads"
+            )
+        subparser.add_argument("--backend", default=PYTHON_BACKEND, choices=[PYTHON_BACKEND, C_BACKEND], help="parser")
+        return subparser
+
+    add_parser("resolve", resolve, with_sub_path=True).add_argument(
+        "--indent", type=int, default=2, help="indentation of the JSON output"
+    )
+    precompile_parser = add_parser("precompile", precompile)
+    precompile_parser.add_argument("directory", help="directory containing the YAML files, searched recursively")
+    precompile_parser.add_argument("--cache-dir", required=True, help="directory where the snapshots are stored")
+    add_parser("imports", list_imports).add_argument("file_path", help="path of the YAML file")
+    add_parser("timings", print_timings, with_sub_path=True).add_argument(
+        "--max-lines", type=int, default=10, help="maximum number of operations printed for each phase"
+    )
+
+    parsed_arguments = parser.parse_args(arguments)
+    return int(parsed_arguments.command(parsed_arguments))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
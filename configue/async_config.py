@@ -0,0 +1,115 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable, List, Optional, TypeVar, Union
+
+from .config import Config
+from .configue_loader import EVENT_LOOP, PYTHON_BACKEND
+from .profiler import LoadProfiler
+from .utils import load
+
+T = TypeVar("T")
+
+
+class AsyncConfig:
+    """Configuration file from which several sub paths can be loaded without blocking the event loop.
+
+    The files are read and parsed and the objects are instantiated in an executor (the default executor of the event
+    loop unless one is given), several sub paths can be loaded concurrently. The coroutines returned by the callables
+    of () are awaited on the event loop of the caller. The other parameters are the same as the ones of configue.load,
+    except that the imported files are prefetched by default. As with configue.Config, the objects of the first sub
+    path loaded with seek_sub_path are not shared with the sub paths loaded afterwards.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        file_path: str,
+        *,
+        use_cache: bool = False,
+        backend: str = PYTHON_BACKEND,
+        seek_sub_path: bool = False,
+        cache_dir: Optional[str] = None,
+        prefetch_imports: bool = True,
+        profiler: Optional[LoadProfiler] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self._config = Config(
+            file_path,
+            use_cache=use_cache,
+            backend=backend,
+            seek_sub_path=seek_sub_path,
+            cache_dir=cache_dir,
+            prefetch_imports=prefetch_imports,
+            profiler=profiler,
+        )
+        self._executor = executor
+
+    async def get(self, sub_path: Union[str, List[str]] = "", *, frozen: bool = False) -> Any:
+        """Load a sub path of the configuration, see configue.load for the format of sub_path and for frozen."""
+        return await _run_in_executor(self._executor, functools.partial(self._config.get, sub_path, frozen=frozen))
+
+    async def reload(self) -> List[str]:
+        """Reload the configuration if some of its files were modified, see Config.reload.
+
+        :return: the paths of the modified files.
+        """
+        return await _run_in_executor(self._executor, self._config.reload)
+
+    async def reload_environment(self, changed_variables: Optional[Iterable[str]] = None) -> List[str]:
+        """Reload the values using environment variables that were modified, see Config.reload_environment.
+
+        :return: the names of the modified variables.
+        """
+        return await _run_in_executor(
+            self._executor, functools.partial(self._config.reload_environment, changed_variables)
+        )
+
+
+async def aload(  # pylint: disable=too-many-arguments
+    file_path: str,
+    sub_path: Union[str, List[str]] = "",
+    *,
+    logging_config_path: Optional[str] = None,
+    use_cache: bool = False,
+    backend: str = PYTHON_BACKEND,
+    seek_sub_path: bool = False,
+    cache_dir: Optional[str] = None,
+    prefetch_imports: bool = True,
+    profiler: Optional[LoadProfiler] = None,
+    executor: Optional[Executor] = None,
+    frozen: bool = False,
+) -> Any:
+    """Load configuration from a YAML file without blocking the event loop.
+
+    The parameters are the same as the ones of configue.load, except that the imported files are prefetched by
+    default and that the lazy mappings are not supported, as they would instantiate their objects on the event loop.
+
+    :param executor: executor in which the files are read and parsed and the objects are instantiated, the default
+    executor of the event loop is used if None. The coroutines returned by the callables of () are awaited on the event
+    loop of the caller.
+    """
+    return await _run_in_executor(
+        executor,
+        functools.partial(
+            load,
+            file_path,
+            sub_path,
+            logging_config_path=logging_config_path,
+            use_cache=use_cache,
+            backend=backend,
+            seek_sub_path=seek_sub_path,
+            cache_dir=cache_dir,
+            prefetch_imports=prefetch_imports,
+            profiler=profiler,
+            frozen=frozen,
+        ),
+    )
+
+
+async def _run_in_executor(executor: Optional[Executor], function: Callable[..., T], *args: Any) -> T:
+    event_loop = asyncio.get_running_loop()
+    # The context of the caller is copied, so that the loaders find the event loop on which to await the coroutines
+    context = contextvars.copy_context()
+    context.run(EVENT_LOOP.set, event_loop)
+    return await event_loop.run_in_executor(executor, functools.partial(context.run, function, *args))
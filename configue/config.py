@@ -0,0 +1,110 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .configue_loader import PYTHON_BACKEND
+from .disk_node_cache import DiskNodeCache
+from .frozen import Freezer
+from .node_cache import DEFAULT_NODE_CACHE
+from .profiler import LOAD_PHASE, LoadProfiler, measure
+from .root_loader import RootLoader
+
+
+class Config:
+    """Configuration file from which several sub paths can be loaded.
+
+    The files are parsed once for all the sub paths, and the objects referenced from several sub paths (e.g. with
+    !cfg) are only instantiated once. The parameters are the same as the ones of configue.load. With seek_sub_path, the
+    first sub path loaded from each file is composed on its own: its objects are not shared with the sub paths loaded
+    afterwards, which are loaded from the whole file.
+
+    Unless thread_safe is False, the configuration can be loaded by several threads at the same time: each file is
+    parsed by a single thread, and each object is instantiated by a single thread while the threads loading other
+    objects are not blocked.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        file_path: str,
+        *,
+        logging_config_path: Optional[str] = None,
+        use_cache: bool = False,
+        backend: str = PYTHON_BACKEND,
+        seek_sub_path: bool = False,
+        cache_dir: Optional[str] = None,
+        prefetch_imports: bool = False,
+        profiler: Optional[LoadProfiler] = None,
+        thread_safe: bool = True,
+    ) -> None:
+        self._root_loader = RootLoader(
+            file_path,
+            node_cache=DEFAULT_NODE_CACHE if use_cache else None,
+            backend=backend,
+            seek_sub_path=seek_sub_path,
+            disk_node_cache=None if cache_dir is None else DiskNodeCache(cache_dir),
+            prefetch_imports=prefetch_imports,
+            profiler=profiler,
+            thread_safe=thread_safe,
+        )
+        if logging_config_path is not None:
+            self._root_loader.load_logging_config(logging_config_path)
+        # Sub paths loaded so far, they are loaded again when the configuration is reloaded
+        self._loaded_sub_paths: Dict[Tuple[Union[str, Tuple[str, ...]], bool], None] = {}
+        self._reload_lock = threading.Lock()
+        self._freezer = Freezer()
+
+    def get(self, sub_path: Union[str, List[str]] = "", *, lazy: bool = False, frozen: bool = False) -> Any:
+        """Load a sub path of the configuration, see configue.load for the format of sub_path and for the parameters.
+
+        The frozen values of all the sub paths share their identical subtrees.
+        """
+        root_loader = self._root_loader
+        with measure(root_loader.profiler, LOAD_PHASE, sub_path if isinstance(sub_path, str) else ".".join(sub_path)):
+            loaded_object = root_loader.load_root_file(sub_path, lazy=lazy)
+        self._loaded_sub_paths[(sub_path if isinstance(sub_path, str) else tuple(sub_path), lazy)] = None
+        if frozen:
+            return self._freezer.freeze(loaded_object)
+        return loaded_object
+
+    def reload(self) -> List[str]:
+        """Reload the configuration if some of its files were modified.
+
+        Only the modified files are parsed again, and only the objects depending on modified values are instantiated
+        again: get returns the same instances as before for the other sub paths. The sub paths that were loaded before
+        are loaded again, if one of them cannot be loaded the exception is raised and the previous version of the
+        configuration is kept.
+
+        :return: the paths of the modified files.
+        """
+        with self._reload_lock:
+            changed_files = self._root_loader.get_changed_files()
+            if changed_files:
+                self._replace_root_loader(self._root_loader.reload(changed_files))
+            return changed_files
+
+    def reload_environment(self, changed_variables: Optional[Iterable[str]] = None) -> List[str]:
+        """Reload the values using environment variables that were modified.
+
+        The files are not parsed again, and only the objects depending on modified variables, directly or through the
+        nodes they reference, are instantiated again: get returns the same instances as before for the other sub
+        paths, including the objects using other variables. The sub paths that were loaded before are loaded again, as
+        with reload.
+
+        :param changed_variables: the names of the modified variables, by default the variables used by the loaded
+        values whose current value differs from the one read when the configuration was created or last reloaded.
+        :return: the names of the modified variables.
+        """
+        with self._reload_lock:
+            if changed_variables is None:
+                changed_variables = self._root_loader.get_changed_env_variables()
+            else:
+                changed_variables = sorted(set(changed_variables))
+            if changed_variables:
+                self._replace_root_loader(self._root_loader.reload_environment(changed_variables))
+            return changed_variables
+
+    def _replace_root_loader(self, root_loader: RootLoader) -> None:
+        for sub_path, lazy in list(self._loaded_sub_paths):
+            root_loader.load_root_file(sub_path if isinstance(sub_path, str) else list(sub_path), lazy=lazy)
+        self._root_loader = root_loader
+        # The values of the previous version are not shared with the next ones
+        self._freezer = Freezer()
@@ -1,46 +1,90 @@
+import asyncio
+import inspect
 import logging
 import os
 import re
-from collections.abc import Hashable
-from typing import Any, List, Mapping, Optional, Union
+from collections.abc import Awaitable, Hashable
+from contextvars import ContextVar
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple, Type, Union
+from weakref import WeakKeyDictionary
 
 import yaml
+from yaml.composer import Composer
 from yaml.constructor import ConstructorError
+from yaml.resolver import Resolver
 
-from configue.exceptions import NonCallableError, NotFoundError
+try:
+    from yaml._yaml import CParser
+except ImportError:  # pragma: nocover
+    CParser = None  # type: ignore[assignment,misc]
 
-# Matches "${myvar-default}" -> "${", "myvar", "-", "default", "}"
-# or "${myvar}" -> "${", "myvar", "", "", "}"
-ENV_PATTERN_REGEX = re.compile(r"(\${)(\w+)(-?)((?:(?![^}]*\${)[^}])*)(})")
+from configue.construction_locks import ConstructionLocks
+from configue.env_interpolator import EnvInterpolator
+from configue.exceptions import NonCallableError, NotFoundError, UnknownBackendError
+from configue.profiler import CONSTRUCTOR_PHASE, INTERPOLATION_PHASE, LoadProfiler
+
+# Matches the plain scalars that are parsed as a single value, without any other YAML syntax
+PLAIN_SCALAR_REGEX = re.compile(r"(?:(?!---|\.\.\.)(?:[\w.+~/]|-(?=\S))[\w.+~/ -]*)?")
+# Matches the characters that have a special meaning in quoted scalars
+QUOTED_SCALAR_SYNTAX_REGEX = re.compile(r"[\\'\"\n]|\${")
+IMPLICIT_SCALAR_TAGS = {
+    "tag:yaml.org,2002:null",
+    "tag:yaml.org,2002:bool",
+    "tag:yaml.org,2002:int",
+    "tag:yaml.org,2002:float",
+    "tag:yaml.org,2002:str",
+}
+MERGE_TAG = "tag:yaml.org,2002:merge"
 CONSTRUCTOR_KEY = "()"
 ESCAPED_CONSTRUCTOR_KEY = "\\()"
+PYTHON_BACKEND = "python"
+C_BACKEND = "c"
+
+# Process-wide cache of the dotted paths imported by () and !ext
+PYTHON_OBJECTS_BY_PATH: Dict[str, Tuple[Any, List[str]]] = {}
+# Explicit items of the mappings whose merge keys were flattened, the merged items being inserted before them. The
+# composed nodes can be shared by several loaders, e.g. with the node caches
+EXPLICIT_ITEMS_BY_MAPPING: "WeakKeyDictionary[yaml.MappingNode, List[Tuple[yaml.Node, yaml.Node]]]" = (
+    WeakKeyDictionary()
+)
+# Event loop of the coroutine loading the configuration, the results of the async factories are awaited on this loop
+EVENT_LOOP: ContextVar[Optional[asyncio.AbstractEventLoop]] = ContextVar("configue_event_loop", default=None)
 
 
 class ConfigueLoader(yaml.FullLoader):  # pylint: disable=too-many-ancestors
     logger = logging.getLogger(__name__)
+    env_interpolator = EnvInterpolator(os.environ)
+    profiler: Optional[LoadProfiler] = None
+    # Set when several threads construct the same nodes, each thread having its own loader
+    construction_locks: Optional[ConstructionLocks] = None
+    # Names of the environment variables replaced in each constructed scalar node, when they are tracked
+    env_variables_by_node: Optional[Dict[yaml.Node, FrozenSet[str]]] = None
+
+    def flatten_mapping(self, node: yaml.MappingNode) -> None:
+        if self.construction_locks is None:
+            self._flatten_mapping(node)
+            return
+        # The merged mappings are flattened too, while other threads may be constructing them
+        with self.construction_locks.lock(node):
+            self._flatten_mapping(node)
+
+    def _flatten_mapping(self, node: yaml.MappingNode) -> None:
+        if node not in EXPLICIT_ITEMS_BY_MAPPING and any(key_node.tag == MERGE_TAG for key_node, _ in node.value):
+            EXPLICIT_ITEMS_BY_MAPPING[node] = [item for item in node.value if item[0].tag != MERGE_TAG]
+        super().flatten_mapping(node)
+
+    def construct_object(self, node: yaml.Node, deep: bool = False) -> Any:
+        if self.construction_locks is None or node in self.constructed_objects:
+            return super().construct_object(node, deep)
+        with self.construction_locks.lock(node):
+            # The object is only added to the constructed objects once it is fully constructed
+            return super().construct_object(node, deep)
 
     def construct_yaml_map(self, node: yaml.MappingNode) -> Any:
         mapping: Mapping[Hashable, Any] = self.construct_mapping(node)
         if isinstance(mapping, dict) and CONSTRUCTOR_KEY in mapping:
             path = mapping.pop(CONSTRUCTOR_KEY)
-            object_path_elements = path.split(".")
-            remaining_path_elements: List[str] = []
-            exceptions: list[Optional[str]] = []
-            while object_path_elements:
-                try:
-                    cls = self.find_python_name(
-                        ".".join(object_path_elements),
-                        node.start_mark,
-                        unsafe=True,
-                    )
-                    break
-                except ConstructorError as error:
-                    exceptions.append(error.problem)
-                    remaining_path_elements.insert(0, object_path_elements.pop(-1))
-            else:
-                raise NotFoundError(
-                    f"Could not load element {path} {node.start_mark}, exceptions encountered: {exceptions!r}"
-                ) from None
+            cls, remaining_path_elements = self.find_python_object(path, node.start_mark)
             for path_element in remaining_path_elements:
                 cls = getattr(cls, path_element)
 
@@ -49,28 +93,114 @@ class ConfigueLoader(yaml.FullLoader):  # pylint: disable=too-many-ancestors
                     f"Error while constructing a Python instance {node.start_mark}, "
                     f"expected a callable but found {type(cls)}"
                 )
-            return cls(**mapping)
+            if self.profiler is None:
+                return self._await_result(cls(**mapping))
+            with self.profiler.measure(CONSTRUCTOR_PHASE, path):
+                return self._await_result(cls(**mapping))
         if isinstance(mapping, dict) and ESCAPED_CONSTRUCTOR_KEY in mapping:
             mapping[CONSTRUCTOR_KEY] = mapping.pop(ESCAPED_CONSTRUCTOR_KEY)
         return mapping
 
+    @staticmethod
+    def _await_result(result: Any) -> Any:
+        """Wait for the result of an async factory when the configuration is loaded by configue.aload or AsyncConfig.
+
+        The objects are constructed in a worker thread, the coroutine is run on the event loop of the caller.
+        """
+        event_loop = EVENT_LOOP.get()
+        if event_loop is None or not inspect.isawaitable(result):
+            return result
+        return asyncio.run_coroutine_threadsafe(_await(result), event_loop).result()
+
+    def find_python_object(self, path: str, mark: Optional[yaml.Mark]) -> Tuple[Any, List[str]]:
+        """Import the longest importable prefix of a dotted path.
+
+        :return: the imported object and the elements of the path that are left to load from this object
+        """
+        if path in PYTHON_OBJECTS_BY_PATH:
+            return PYTHON_OBJECTS_BY_PATH[path]
+        object_path_elements = path.split(".")
+        remaining_path_elements: List[str] = []
+        exceptions: list[Optional[str]] = []
+        while object_path_elements:
+            try:
+                loaded_object = self.find_python_name(
+                    ".".join(object_path_elements),
+                    mark,
+                    unsafe=True,
+                )
+                break
+            except ConstructorError as error:
+                exceptions.append(error.problem)
+                remaining_path_elements.insert(0, object_path_elements.pop(-1))
+        else:
+            raise NotFoundError(
+                f"Could not load element {path} {mark}, exceptions encountered: {exceptions!r}"
+            ) from None
+        PYTHON_OBJECTS_BY_PATH[path] = (loaded_object, remaining_path_elements)
+        return loaded_object, remaining_path_elements
+
     def construct_scalar(self, node: Union[yaml.ScalarNode, yaml.MappingNode]) -> Any:
+        if not isinstance(node, yaml.ScalarNode) or "${" not in node.value:
+            return self._construct_interpolated_scalar(node)
+        # The values loaded again from an interpolated value are recorded with the node containing them
+        is_nested = self.env_interpolator.is_recording()
+        with self.env_interpolator.record_variables() as variable_names:
+            if self.profiler is None:
+                scalar = self._construct_interpolated_scalar(node)
+            else:
+                with self.profiler.measure(INTERPOLATION_PHASE, str(node.start_mark.name)):
+                    scalar = self._construct_interpolated_scalar(node)
+        if not is_nested and self.env_variables_by_node is not None:
+            # pylint: disable-next=unsupported-assignment-operation
+            self.env_variables_by_node[node] = frozenset(variable_names)
+        return scalar
+
+    def _construct_interpolated_scalar(self, node: Union[yaml.ScalarNode, yaml.MappingNode]) -> Any:
         scalar = yaml.FullLoader.construct_scalar(self, node)
         if isinstance(node, yaml.MappingNode):  # pragma: nocover
             return scalar
-        replaced_value = ""
-        end_pos = 0
-        for match in ENV_PATTERN_REGEX.finditer(scalar):
-            env_var_name, has_default, default_value = match.group(2, 3, 4)
-            start_pos = match.start(1)
-            if env_var_name not in os.environ and not has_default:
-                self.logger.warning(f"Missing environment var: '{env_var_name}', no default is set")
-            replaced_value += f"{scalar[end_pos:start_pos]}{os.environ.get(env_var_name, default_value)}"
-            end_pos = match.end(5)
-        replaced_value += scalar[end_pos:]
-        if replaced_value == node.value:
+        replaced_value = self.env_interpolator.interpolate(scalar)
+        if replaced_value is None or replaced_value == node.value:
             return scalar
+        # A variable has been replaced, convert the string to a number if needed
         if node.style in ["'", '"']:
+            if not QUOTED_SCALAR_SYNTAX_REGEX.search(replaced_value):
+                return replaced_value
             replaced_value = f"{node.style}{replaced_value}{node.style}"
-        # A variable has been replaced, reload to convert string to number if needed or replace again
+        else:
+            stripped_value = replaced_value.strip()
+            if PLAIN_SCALAR_REGEX.fullmatch(stripped_value):
+                tag = self.resolve(yaml.ScalarNode, stripped_value, (True, False))  # type: ignore[no-untyped-call]
+                if tag in IMPLICIT_SCALAR_TAGS:
+                    return self.yaml_constructors[tag](self, yaml.ScalarNode(tag, stripped_value, node.start_mark))
+        # The value contains YAML syntax (e.g. a list or another variable), reload it to replace it again if needed
         return yaml.load(replaced_value, Loader=self.__class__)
+
+
+async def _await(awaitable: Awaitable[Any]) -> Any:
+    return await awaitable
+
+
+# Classes used to parse and compose the files, the nodes are always constructed by a ConfigueLoader
+PARSER_CLASSES_BY_BACKEND: Dict[str, Type[yaml.FullLoader]] = {PYTHON_BACKEND: ConfigueLoader}
+if CParser is not None:
+
+    class CConfigueParser(CParser, Composer, Resolver):
+        """libyaml parser, whose events can also be composed one node at a time by the pure Python composer."""
+
+        def __init__(self, stream: Any) -> None:
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            Resolver.__init__(self)
+
+    PARSER_CLASSES_BY_BACKEND[C_BACKEND] = CConfigueParser  # type: ignore[assignment]
+
+
+def get_parser_class(backend: str) -> Type[yaml.FullLoader]:
+    if backend not in (PYTHON_BACKEND, C_BACKEND):
+        raise UnknownBackendError(f"Unknown backend {backend!r}, expected {PYTHON_BACKEND!r} or {C_BACKEND!r}")
+    if backend not in PARSER_CLASSES_BY_BACKEND:
+        ConfigueLoader.logger.debug(f"PyYAML was built without libyaml, falling back to the {PYTHON_BACKEND} backend")
+        backend = PYTHON_BACKEND
+    return PARSER_CLASSES_BY_BACKEND[backend]
@@ -0,0 +1,60 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+
+from yaml import Node
+from yaml.constructor import ConstructorError
+
+
+class ConstructionLocks:
+    """Reentrant locks of the nodes being constructed, shared by the threads loading the same configuration.
+
+    A thread constructing a node holds its lock until the node and its children are constructed, so that the other
+    threads wait for the object instead of constructing it again, while the other nodes are constructed concurrently.
+    Waiting for a node whose construction is itself waiting for the current thread means that the nodes reference each
+    other, which raises the same error as when loading them in a single thread.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        # Thread constructing each node, and the number of times it acquired the lock of the node
+        self._owners_by_node: Dict[Node, Tuple[int, int]] = {}
+        self._awaited_nodes_by_thread: Dict[int, Node] = {}
+
+    @contextmanager
+    def lock(self, node: Node) -> Iterator[None]:
+        thread_id = threading.get_ident()
+        with self._condition:
+            while node in self._owners_by_node and self._owners_by_node[node][0] != thread_id:
+                if self._is_waiting_for(self._owners_by_node[node][0], thread_id):
+                    raise ConstructorError(None, None, "found unconstructable recursive node", node.start_mark)
+                self._awaited_nodes_by_thread[thread_id] = node
+                try:
+                    self._condition.wait()
+                finally:
+                    del self._awaited_nodes_by_thread[thread_id]
+            _, lock_count = self._owners_by_node.get(node, (thread_id, 0))
+            self._owners_by_node[node] = (thread_id, lock_count + 1)
+        try:
+            yield
+        finally:
+            with self._condition:
+                _, lock_count = self._owners_by_node[node]
+                if lock_count == 1:
+                    del self._owners_by_node[node]
+                    self._condition.notify_all()
+                else:
+                    self._owners_by_node[node] = (thread_id, lock_count - 1)
+
+    def _is_waiting_for(self, thread_id: int, other_thread_id: int) -> bool:
+        """Return whether a thread is waiting, directly or not, for a node locked by another thread."""
+        visited_thread_ids = set()
+        while thread_id not in visited_thread_ids:
+            if thread_id == other_thread_id:
+                return True
+            visited_thread_ids.add(thread_id)
+            awaited_node = self._awaited_nodes_by_thread.get(thread_id)
+            if awaited_node is None or awaited_node not in self._owners_by_node:
+                return False
+            thread_id = self._owners_by_node[awaited_node][0]
+        return False
@@ -0,0 +1,130 @@
+import hashlib
+import importlib.metadata
+import logging
+import marshal
+import os
+import tempfile
+from typing import Any, Callable, List, Optional, Tuple, cast
+
+import yaml
+from yaml import Mark, MappingNode, Node, ScalarNode, SequenceNode
+
+from .node_cache import get_file_stamp
+from .nodes import iter_nodes
+
+SNAPSHOT_FORMAT_VERSION = 1
+try:
+    CONFIGUE_VERSION: Optional[str] = importlib.metadata.version("configue")
+except importlib.metadata.PackageNotFoundError:  # pragma: nocover
+    CONFIGUE_VERSION = None
+
+SCALAR_KIND = 0
+SEQUENCE_KIND = 1
+MAPPING_KIND = 2
+
+# kind, tag, value, style, start line, start column, end line, end column
+NodeEntry = Tuple[int, str, Any, Any, int, int, int, int]
+
+
+class DiskNodeCache:
+    """Cache of composed YAML node trees, stored as compact snapshot files in a directory.
+
+    Each file has its own snapshot, which is only used while the modification time and the size of the file are the
+    ones it was composed from, and if it was written with the same configue and PyYAML versions. As the imported files
+    are composed separately, a modification of an imported file only invalidates the snapshot of this file.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, cache_dir: str) -> None:
+        self._cache_dir = cache_dir
+
+    def get_node(self, file_path: str, compose: Callable[[], Optional[Node]]) -> Optional[Node]:
+        real_path = os.path.realpath(file_path)
+        header = self._get_header(real_path, get_file_stamp(real_path))
+        snapshot_path = self._get_snapshot_path(real_path)
+        try:
+            with open(snapshot_path, "rb") as snapshot_file:
+                snapshot_header, root_index, entries = marshal.load(snapshot_file)
+            if snapshot_header == header:
+                return _decode_nodes(real_path, root_index, entries)
+        except FileNotFoundError:
+            pass
+        except (EOFError, ValueError, TypeError, IndexError, OSError) as error:
+            self.logger.warning(f"Could not read snapshot {snapshot_path} of {file_path}: {error!r}")
+
+        node = compose()
+        self._write_snapshot(snapshot_path, (header, *_encode_nodes(node)))
+        return node
+
+    def _write_snapshot(self, snapshot_path: str, snapshot: Tuple[Any, ...]) -> None:
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            # The snapshot is renamed once written, so that other processes never read a partial snapshot
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                marshal.dump(snapshot, temp_file)
+            os.replace(temp_path, snapshot_path)
+        except OSError as error:
+            self.logger.warning(f"Could not write snapshot {snapshot_path}: {error!r}")
+
+    def _get_snapshot_path(self, real_path: str) -> str:
+        return os.path.join(self._cache_dir, f"{hashlib.sha256(real_path.encode()).hexdigest()}.snapshot")
+
+    @staticmethod
+    def _get_header(real_path: str, stamp: Tuple[int, int]) -> Tuple[Any, ...]:
+        return SNAPSHOT_FORMAT_VERSION, CONFIGUE_VERSION, yaml.__version__, real_path, stamp
+
+
+def _encode_nodes(root_node: Optional[Node]) -> Tuple[int, List[NodeEntry]]:
+    if root_node is None:
+        return -1, []
+    nodes = list(iter_nodes(root_node))
+    indexes_by_node = {node: index for index, node in enumerate(nodes)}
+    entries: List[NodeEntry] = []
+    for node in nodes:
+        if isinstance(node, ScalarNode):
+            kind, value, style = SCALAR_KIND, node.value, node.style
+        elif isinstance(node, SequenceNode):
+            kind, style = SEQUENCE_KIND, node.flow_style
+            value = tuple(indexes_by_node[item_node] for item_node in node.value)
+        else:
+            kind, style = MAPPING_KIND, cast(MappingNode, node).flow_style
+            value = tuple(indexes_by_node[item_node] for key_value_nodes in node.value for item_node in key_value_nodes)
+        entries.append(
+            (
+                kind,
+                node.tag,
+                value,
+                style,
+                node.start_mark.line,
+                node.start_mark.column,
+                node.end_mark.line,
+                node.end_mark.column,
+            )
+        )
+    return 0, entries
+
+
+def _decode_nodes(file_path: str, root_index: int, entries: List[NodeEntry]) -> Optional[Node]:
+    if root_index < 0:
+        return None
+    nodes: List[Node] = []
+    for kind, tag, value, style, start_line, start_column, end_line, end_column in entries:
+        start_mark = Mark(file_path, 0, start_line, start_column, None, 0)
+        end_mark = Mark(file_path, 0, end_line, end_column, None, 0)
+        if kind == SCALAR_KIND:
+            nodes.append(ScalarNode(tag, value, start_mark, end_mark, style))
+        elif kind == SEQUENCE_KIND:
+            nodes.append(SequenceNode(tag, [], start_mark, end_mark, style))
+        else:
+            nodes.append(MappingNode(tag, [], start_mark, end_mark, style))
+    # The children are linked once all the nodes are created, as recursive nodes may reference their parents
+    for node, (kind, _, value, *_) in zip(nodes, entries):
+        if kind == SEQUENCE_KIND:
+            node.value = [nodes[index] for index in value]
+        elif kind == MAPPING_KIND:
+            node.value = [
+                (nodes[key_index], nodes[value_index]) for key_index, value_index in zip(value[::2], value[1::2])
+            ]
+    return nodes[root_index]
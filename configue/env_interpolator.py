@@ -0,0 +1,68 @@
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Mapping, Optional, Set
+
+# Matches "${myvar-default}" -> "${", "myvar", "-", "default", "}"
+# or "${myvar}" -> "${", "myvar", "", "", "}"
+ENV_PATTERN_REGEX = re.compile(r"(\${)(\w+)(-?)((?:(?![^}]*\${)[^}])*)(})")
+
+
+class EnvInterpolator:
+    """Replace the "${VAR_NAME}" and "${VAR_NAME-default}" patterns with the values of environment variables."""
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, environment: Mapping[str, str]) -> None:
+        self._environment = environment
+        # Sets of the variable names recorded by the current thread, one for each nested record_variables
+        self._recorded_names = threading.local()
+
+    @property
+    def environment(self) -> Mapping[str, str]:
+        return self._environment
+
+    def is_recording(self) -> bool:
+        """Return whether the current thread is recording the replaced variables."""
+        return bool(getattr(self._recorded_names, "stack", None))
+
+    @contextmanager
+    def record_variables(self) -> Iterator[Set[str]]:
+        """Record the names of the variables replaced by the current thread in the context, including the nested
+        contexts.
+        """
+        stack: Optional[List[Set[str]]] = getattr(self._recorded_names, "stack", None)
+        if stack is None:
+            stack = self._recorded_names.stack = []
+        variable_names: Set[str] = set()
+        stack.append(variable_names)
+        try:
+            yield variable_names
+        finally:
+            stack.pop()
+            if stack:
+                stack[-1].update(variable_names)
+
+    def interpolate(self, value: str) -> Optional[str]:
+        """Return the value with its environment variables replaced, or None if it does not contain any variable."""
+        if "${" not in value:
+            return None
+        recorded_names = getattr(self._recorded_names, "stack", None)
+        replaced_value = ""
+        end_pos = 0
+        for match in ENV_PATTERN_REGEX.finditer(value):
+            env_var_name, has_default, default_value = match.group(2, 3, 4)
+            start_pos = match.start(1)
+            if recorded_names:
+                recorded_names[-1].add(env_var_name)
+            env_var_value = self._environment.get(env_var_name)
+            if env_var_value is None:
+                if not has_default:
+                    self.logger.warning(f"Missing environment var: '{env_var_name}', no default is set")
+                env_var_value = default_value
+            replaced_value += f"{value[end_pos:start_pos]}{env_var_value}"
+            end_pos = match.end(5)
+        if not end_pos:
+            return None
+        return replaced_value + value[end_pos:]
@@ -18,5 +18,9 @@ class NotFoundError(ConfigueError):
     pass
 
 
+class UnknownBackendError(ConfigueError):
+    pass
+
+
 class InvalidNodeType(Exception):
     pass
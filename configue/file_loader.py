@@ -1,69 +1,397 @@
+import functools
 import logging
 import os
-from typing import Any, List, Optional, TYPE_CHECKING, Type, Union, cast
+import threading
+from contextlib import nullcontext
+from typing import AbstractSet, Any, Dict, FrozenSet, List, Optional, Set, TYPE_CHECKING, Tuple, Type, Union, cast
 
 from yaml import Loader, MappingNode, Node, ScalarNode, SequenceNode
-from yaml.constructor import ConstructorError
 
-from .configue_loader import ConfigueLoader
-from .exceptions import SubPathNotFound, InvalidNodeType, NotFoundError
+from .configue_loader import CONSTRUCTOR_KEY, EXPLICIT_ITEMS_BY_MAPPING, MERGE_TAG, ConfigueLoader, get_parser_class
+from .exceptions import ConfigueRecursionError, SubPathNotFound, InvalidNodeType
+from .lazy import LazyMapping, LazySequence
+from .node_cache import FileStamp, get_file_stamp
+from .node_matcher import UnchangedNodeMatcher
+from .nodes import format_reference, iter_nodes
+from .profiler import IMPORT_PHASE, PARSE_PHASE, measure
+from .sub_path_seeker import SubPathSeeker
 
 if TYPE_CHECKING:
     from .root_loader import RootLoader
 
+MAPPING_TAG = "tag:yaml.org,2002:map"
+SEQUENCE_TAG = "tag:yaml.org,2002:seq"
 
-class FileLoader:
+
+class FileLoader:  # pylint: disable=too-many-instance-attributes
     logger = logging.getLogger(__name__)
 
-    def __init__(self, file_path: str, root_loader: "RootLoader") -> None:
+    def __init__(
+        self,
+        file_path: str,
+        root_loader: "RootLoader",
+        previous_file_loader: Optional["FileLoader"] = None,
+        *,
+        document_node: Optional[Node] = None,
+    ) -> None:
         self._file_path = file_path
         self._root_loader = root_loader
+        # Loader of the same file before the configuration was reloaded, whose objects are reused if unchanged
+        self._previous_file_loader: Optional[FileLoader] = None
+        if previous_file_loader is not None and previous_file_loader.is_root_node_composed:
+            self._previous_file_loader = previous_file_loader
+        self._parser_cls = get_parser_class(root_loader.backend)
+        # Names of the environment variables replaced in the constructed scalars, to reload the values using them
+        self.env_variables_by_node: Dict[Node, FrozenSet[str]] = {}
 
         loader_cls: Type[Loader] = cast(
             Type[Loader],
-            type("CustomLoader", (ConfigueLoader,), {"yaml_loader": self}),
+            type(
+                "CustomLoader",
+                (ConfigueLoader,),
+                {
+                    "yaml_loader": self,
+                    "env_interpolator": root_loader.env_interpolator,
+                    "profiler": root_loader.profiler,
+                    "construction_locks": root_loader.construction_locks,
+                    "env_variables_by_node": self.env_variables_by_node,
+                },
+            ),
         )
 
         loader_cls.add_multi_constructor("!import", self._load_import)  # type: ignore[no-untyped-call]
         loader_cls.add_constructor("!path", self._load_path)
         loader_cls.add_constructor("!cfg", self._load_cfg)
         loader_cls.add_constructor("!ext", self._load_ext)
-        loader_cls.add_constructor("tag:yaml.org,2002:map", loader_cls.construct_yaml_map)  # type: ignore[type-var]
+        loader_cls.add_constructor(MAPPING_TAG, loader_cls.construct_yaml_map)  # type: ignore[type-var]
+
+        # The loaders are only used to construct objects, the nodes are composed by a separate parser
+        self._loader_cls = loader_cls
+        self._thread_loaders = threading.local()
+        self._constructed_objects: Dict[Node, Any] = {}
+        # Lock of the composition of the file
+        self._lock = threading.RLock()
+        # The documents of a multi-document file are composed one at a time, and loaded by separate file loaders
+        self._root_node: Optional[Node] = document_node
+        self._is_root_node_composed = document_node is not None
+        self._can_seek_sub_path = (
+            root_loader.seek_sub_path
+            and root_loader.node_cache is None
+            and root_loader.disk_node_cache is None
+            and not root_loader.prefetch_imports
+            and previous_file_loader is None
+            and document_node is None
+        )
+        self._value_nodes_by_mapping: Dict[MappingNode, Dict[str, Node]] = {}
+        self._nodes_by_path: Dict[Tuple[str, ...], Tuple[Node, int]] = {}
+        self._lazy_objects_by_node: Dict[Node, Any] = {}
+        self.file_stamp: Optional[FileStamp] = None
+        self.imported_files: Set[str] = set()
+        if previous_file_loader is not None:
+            # The imports of the reused objects are not loaded again
+            self.imported_files.update(previous_file_loader.imported_files)
+            if file_path not in root_loader.changed_files:
+                self.file_stamp = previous_file_loader.file_stamp
+
+    @property
+    def root_node(self) -> Optional[Node]:
+        if not self._is_root_node_composed:
+            with self._lock:
+                if not self._is_root_node_composed:
+                    self._root_node = self._get_root_node()
+                    self._previous_file_loader = None
+                    # The flag is set last, so that the other threads wait until the previous objects are reused
+                    self._is_root_node_composed = True
+        return self._root_node
+
+    def _get_root_node(self) -> Optional[Node]:
+        previous_file_loader = self._previous_file_loader
+        if previous_file_loader is None:
+            return self._compose_root_node()
+        if self._file_path in self._root_loader.changed_files:
+            root_node = self._compose_root_node()
+            self._reuse_unchanged_objects(previous_file_loader, root_node)
+            return root_node
+        root_node = previous_file_loader.root_node
+        self._reuse_nodes(previous_file_loader)
+        if self._file_path in self._root_loader.affected_files:
+            self._reuse_unchanged_objects(previous_file_loader, root_node)
+        else:
+            self._constructed_objects.update(previous_file_loader.constructed_objects)
+        return root_node
+
+    @property
+    def is_root_node_composed(self) -> bool:
+        return self._is_root_node_composed
+
+    @property
+    def constructed_objects(self) -> Dict[Node, Any]:
+        return self._constructed_objects
+
+    @property
+    def _loader(self) -> ConfigueLoader:
+        # Each thread has its own loader, as a loader keeps the state of the objects it is constructing
+        loader: Optional[ConfigueLoader] = getattr(self._thread_loaders, "loader", None)
+        if loader is None:
+            loader = cast(ConfigueLoader, self._loader_cls(""))
+            loader.constructed_objects = self._constructed_objects
+            self._thread_loaders.loader = loader
+        return loader
+
+    def uses_env_variables(self, variable_names: AbstractSet[str]) -> bool:
+        """Return whether one of the constructed scalars of the file uses one of the environment variables."""
+        # The values are copied, as other threads may be constructing scalars
+        used_names_by_node = list(self.env_variables_by_node.values())
+        return any(not variable_names.isdisjoint(used_names) for used_names in used_names_by_node)
+
+    def is_modified(self) -> bool:
+        """Return whether the file was modified since it was composed."""
+        try:
+            file_stamp: Optional[FileStamp] = get_file_stamp(self._file_path)
+        except OSError:
+            file_stamp = None
+        return file_stamp != self.file_stamp
+
+    def _read_file_stamp(self) -> None:
+        try:
+            # The stamp is read before parsing, so that a concurrent modification is detected at the next reload
+            self.file_stamp = get_file_stamp(self._file_path)
+        except OSError:
+            self.file_stamp = None
+
+    def _compose_root_node(self) -> Optional[Node]:
+        self._read_file_stamp()
+        compose = self._compose
+        if self._root_loader.disk_node_cache is not None:
+            compose = functools.partial(self._root_loader.disk_node_cache.get_node, self._file_path, compose)
+        with measure(self._root_loader.profiler, PARSE_PHASE, self._file_path):
+            if self._root_loader.node_cache is None:
+                return compose()
+            return self._root_loader.node_cache.get_node(self._file_path, compose)
 
+    def _reuse_nodes(self, previous_file_loader: "FileLoader") -> None:
+        # pylint: disable=protected-access
+        self._value_nodes_by_mapping.update(previous_file_loader._value_nodes_by_mapping)
+        self._nodes_by_path.update(previous_file_loader._nodes_by_path)
+        self.env_variables_by_node.update(previous_file_loader.env_variables_by_node)
+
+    def _reuse_unchanged_objects(self, previous_file_loader: "FileLoader", root_node: Optional[Node]) -> None:
+        previous_root_node = previous_file_loader.root_node
+        if root_node is None or previous_root_node is None:
+            return
+        previous_objects = previous_file_loader.constructed_objects
+        previous_env_variables = previous_file_loader.env_variables_by_node
+        matcher = UnchangedNodeMatcher(
+            previous_root_node,
+            root_node,
+            self._is_import_unchanged,
+            self._get_cfg_target,
+            is_interpolation_unchanged=self._is_interpolation_unchanged,
+        )
+        for node, previous_node in matcher.match().items():
+            if previous_node in previous_objects:
+                self._constructed_objects[node] = previous_objects[previous_node]
+            if previous_node in previous_env_variables:
+                self.env_variables_by_node[node] = previous_env_variables[previous_node]
+
+    def _is_import_unchanged(self, node: ScalarNode) -> bool:
+        try:
+            path = self._load_path(self._loader, node)
+        except Exception:  # pylint: disable=broad-exception-caught
+            return False
+        return path is None or path not in self._root_loader.affected_files
+
+    def _is_interpolation_unchanged(self, node: ScalarNode) -> bool:
+        # The variables are only recorded for the constructed nodes, the others have no object to reuse
+        return self._root_loader.changed_env_variables.isdisjoint(self.env_variables_by_node.get(node, ()))
+
+    def _get_cfg_target(self, root_node: Node, node: ScalarNode) -> Optional[Tuple[Node, int]]:
+        try:
+            path = self._loader.construct_scalar(node)
+            return self._walk_nodes(root_node, [sub_path for sub_path in path.split(".") if sub_path])
+        except Exception:  # pylint: disable=broad-exception-caught
+            return None
+
+    def _compose(self) -> Optional[Node]:
         with open(self._file_path, encoding="utf-8") as config_file:
-            self._loader = loader_cls(config_file)
-            self._root_node = self._loader.get_single_node()
-        self._loader.dispose()  # type: ignore[no-untyped-call]
+            loader = self._parser_cls(config_file)
+            try:
+                return loader.get_single_node()
+            finally:
+                loader.dispose()
+
+    def get_static_import_paths(self) -> List[str]:
+        """Return the paths of the files imported by the composed file, except those depending on environment
+        variables, in document order.
+        """
+        if self.root_node is None:
+            return []
+        import_paths = []
+        for node in iter_nodes(self.root_node):
+            if (
+                isinstance(node, ScalarNode)
+                and node.tag.startswith("!import")
+                and node.value
+                and "${" not in node.value
+            ):
+                import_paths.append(self._get_path(node.value))
+        return import_paths
 
-    def load(self, path: Union[str, List[str]]) -> Any:
-        if self._root_node is None:
+    def get_import_paths(self) -> List[str]:
+        """Return the paths of the files imported by the composed file, including those depending on environment
+        variables, in document order.
+        """
+        if self.root_node is None:
+            return []
+        import_paths = []
+        for node in iter_nodes(self.root_node):
+            if isinstance(node, ScalarNode) and node.tag.startswith("!import"):
+                path = self._load_path(self._loader, node)
+                if path is not None:
+                    import_paths.append(path)
+        return import_paths
+
+    def _seek(self, path: List[str]) -> Optional[Tuple[Node, List[str]]]:
+        self._read_file_stamp()
+        with open(self._file_path, encoding="utf-8") as config_file:
+            parser = self._parser_cls(config_file)
+            try:
+                seek_result = SubPathSeeker(parser).seek(path)
+            finally:
+                parser.dispose()
+        if seek_result is not None and any(node.tag == "!cfg" for node in iter_nodes(seek_result[0])):
+            # !cfg paths are relative to the root of the document, which has to be composed
             return None
+        return seek_result
 
+    def load(self, path: Union[str, List[str]], *, lazy: bool = False) -> Any:
         if isinstance(path, str):
             path = path.split(".")
+        path = [sub_path for sub_path in path if sub_path]
 
-        current_node = self._root_node
-        is_current_node_loaded = False
-        for sub_path in path:
-            if not sub_path:
-                continue
-            if not is_current_node_loaded:
-                try:
-                    current_node = self._get_node_at_sub_path(sub_path, current_node)
-                except InvalidNodeType:
-                    current_node = self._loader.construct_object(
-                        current_node,
-                        deep=True,
-                    )
-                    is_current_node_loaded = True
-            if is_current_node_loaded:
-                current_node = self._get_element_at_sub_path(sub_path, current_node)
-        if is_current_node_loaded:
-            return current_node
-        return self._loader.construct_object(current_node, deep=True)
+        seek_result = None
+        if self._can_seek_sub_path and path:
+            with self._lock:
+                if self._can_seek_sub_path:
+                    # Only the first path loaded from a file is composed on its own, so that the objects loaded
+                    # afterwards share the same nodes
+                    self._can_seek_sub_path = False
+                    seek_result = self._seek(path)
+        if seek_result is None:
+            if self.root_node is None:
+                return None
+            current_node, walked_path_length = self._get_node_at_path(path)
+            if self._root_loader.seek_sub_path and not lazy:
+                # The references are only walked once the file is composed, to keep seeking the other sub paths
+                self._root_loader.construct_references(self, current_node)
+        else:
+            current_node, path = seek_result
+            current_node, walked_path_length = self._walk_nodes(current_node, path)
 
-    @staticmethod
-    def _get_node_at_sub_path(sub_path: str, current_node: Node) -> Node:
+        current_element = self.construct(current_node, lazy=lazy)
+        for sub_path in path[walked_path_length:]:
+            current_element = self._get_element_at_sub_path(sub_path, current_element)
+        return current_element
+
+    def construct(self, node: Node, *, lazy: bool = False) -> Any:
+        """Construct the object of a node.
+
+        When lazy is set, the mappings, sequences and imported files are returned as read-only proxies constructing
+        their children on first access.
+        """
+        if not lazy:
+            return self._loader.construct_object(node, deep=True)
+        if node not in self._lazy_objects_by_node:
+            construction_locks = self._root_loader.construction_locks
+            with nullcontext() if construction_locks is None else construction_locks.lock(node):
+                if node not in self._lazy_objects_by_node:
+                    self._lazy_objects_by_node[node] = self._construct_lazily(node)
+        return self._lazy_objects_by_node[node]
+
+    def get_node(
+        self, path: Union[str, List[str]], *, followed_nodes: FrozenSet[Node] = frozenset()
+    ) -> Optional[Tuple["FileLoader", Node]]:
+        """Return the node at a path of the file and the file loader constructing it, following the !import and !cfg
+        tags on the path.
+
+        None is returned if the file is empty, or if the path continues below a node that has to be constructed.
+
+        :param followed_nodes: the !import and !cfg nodes followed to reach this path.
+        :raise ConfigueRecursionError: if the path goes through one of followed_nodes.
+        """
+        if isinstance(path, str):
+            path = path.split(".")
+        path = [sub_path for sub_path in path if sub_path]
+        if self.root_node is None:
+            return None
+        node, walked_path_length = self._get_node_at_path(path)
+        return self._follow_references(node, path[walked_path_length:], followed_nodes)
+
+    def _follow_references(
+        self, node: Node, path: List[str], followed_nodes: FrozenSet[Node]
+    ) -> Optional[Tuple["FileLoader", Node]]:
+        if not path:
+            return self, node
+        if not isinstance(node, ScalarNode):
+            return None
+        if node in followed_nodes:
+            raise ConfigueRecursionError(f"Found recursive references: {format_reference(node)}")
+        followed_nodes = followed_nodes | {node}
+        referenced_node = self.get_referenced_node(node, followed_nodes=followed_nodes)
+        if referenced_node is None:
+            return None
+        file_loader, referenced_root_node = referenced_node
+        # pylint: disable=protected-access
+        node, walked_path_length = file_loader._walk_nodes(referenced_root_node, path)
+        return file_loader._follow_references(node, path[walked_path_length:], followed_nodes)
+
+    def get_referenced_node(
+        self, node: ScalarNode, *, followed_nodes: FrozenSet[Node] = frozenset()
+    ) -> Optional[Tuple["FileLoader", Node]]:
+        """Return the node referenced by an !import or !cfg node and the file loader constructing it, see get_node."""
+        if node.tag == "!cfg":
+            return self.get_node(self._loader.construct_scalar(node), followed_nodes=followed_nodes)
+        if not node.tag.startswith("!import"):
+            return None
+        path = self._load_path(self._loader, node)
+        if path is None:
+            return None
+        self.imported_files.add(path)
+        return self._root_loader.get_node(path, node.tag[len("!import") + 1 :], followed_nodes=followed_nodes)
+
+    def _construct_lazily(self, node: Node) -> Any:
+        if isinstance(node, MappingNode) and node.tag == MAPPING_TAG:
+            # Objects instantiated with () and merged mappings need all their values to be constructed
+            if not any(key_node.tag == MERGE_TAG or key_node.value == CONSTRUCTOR_KEY for key_node, _ in node.value):
+                return LazyMapping(self, node)
+        elif isinstance(node, SequenceNode) and node.tag == SEQUENCE_TAG:
+            return LazySequence(self, node)
+        elif isinstance(node, ScalarNode) and node.tag.startswith("!import"):
+            self._root_loader.check_reference_chain(self, node)
+            path = self._load_path(self._loader, node)
+            if path is not None:
+                return self._import_file(path, node.tag[len("!import") + 1 :], lazy=True)
+        elif isinstance(node, ScalarNode) and node.tag == "!cfg":
+            self._root_loader.check_reference_chain(self, node)
+            return self.load(self._loader.construct_scalar(node), lazy=True)
+        return self._loader.construct_object(node, deep=True)
+
+    def _get_node_at_path(self, path: List[str]) -> Tuple[Node, int]:
+        path_key = tuple(path)
+        if path_key not in self._nodes_by_path:
+            self._nodes_by_path[path_key] = self._walk_nodes(cast(Node, self.root_node), path)
+        return self._nodes_by_path[path_key]
+
+    def _walk_nodes(self, current_node: Node, path: List[str]) -> Tuple[Node, int]:
+        """Return the deepest node of the path that is not constructed, and the number of path elements walked."""
+        for index, sub_path in enumerate(path):
+            try:
+                current_node = self._get_node_at_sub_path(sub_path, current_node)
+            except InvalidNodeType:
+                return current_node, index
+        return current_node, len(path)
+
+    def _get_node_at_sub_path(self, sub_path: str, current_node: Node) -> Node:
         if isinstance(current_node, SequenceNode):
             try:
                 sub_path_index = int(sub_path)
@@ -78,12 +406,29 @@ class FileLoader:
                     f"Could not find sub_path element {sub_path_index} in list {current_node.start_mark}"
                 ) from None
         elif isinstance(current_node, MappingNode):
-            for node_key, node_value in current_node.value:
-                if isinstance(node_key, ScalarNode) and str(node_key.value) == sub_path:
-                    return cast(Node, node_value)
-            raise SubPathNotFound(f"Could not find sub_path {sub_path} {current_node.start_mark}")
+            try:
+                return self._get_value_nodes_by_key(current_node)[sub_path]
+            except KeyError:
+                raise SubPathNotFound(f"Could not find sub_path {sub_path} {current_node.start_mark}") from None
         raise InvalidNodeType()
 
+    def _get_value_nodes_by_key(self, mapping_node: MappingNode) -> Dict[str, Node]:
+        if mapping_node not in self._value_nodes_by_mapping:
+            # The merge keys are flattened as the construction of the mapping does, whether it is constructed or not.
+            # The loader flattens the mapping under its construction lock, so its items are not modified afterwards
+            self._loader.flatten_mapping(mapping_node)
+            items = mapping_node.value
+            explicit_items = EXPLICIT_ITEMS_BY_MAPPING.get(mapping_node)
+            if explicit_items is not None:
+                # The explicit keys take precedence over the merged ones, and the last merged keys over the first ones
+                items = explicit_items + items[: len(items) - len(explicit_items)][::-1]
+            value_nodes_by_key: Dict[str, Node] = {}
+            for node_key, node_value in items:
+                if isinstance(node_key, ScalarNode):
+                    value_nodes_by_key.setdefault(str(node_key.value), node_value)
+            self._value_nodes_by_mapping[mapping_node] = value_nodes_by_key
+        return self._value_nodes_by_mapping[mapping_node]
+
     @staticmethod
     def _get_element_at_sub_path(sub_path: str, current_element: Any) -> Any:
         try:
@@ -103,12 +448,20 @@ class FileLoader:
         path = self._load_path(loader, node)
         if path is None:
             return None
-        return self._root_loader.load_file(path, tag_suffix[1:])
+        return self._import_file(path, tag_suffix[1:])
+
+    def _import_file(self, path: str, sub_path: str, *, lazy: bool = False) -> Any:
+        self.imported_files.add(path)
+        with measure(self._root_loader.profiler, IMPORT_PHASE, f"{path}:{sub_path}" if sub_path else path):
+            return self._root_loader.load_file(path, sub_path, lazy=lazy)
 
     def _load_path(self, loader: ConfigueLoader, node: ScalarNode) -> Optional[str]:
         raw_path = loader.construct_scalar(node)
         if raw_path is None:
             return None
+        return self._get_path(raw_path)
+
+    def _get_path(self, raw_path: str) -> str:
         path = os.path.expanduser(raw_path)
         return os.path.join(os.path.dirname(self._file_path), path)
 
@@ -118,24 +471,7 @@ class FileLoader:
 
     def _load_ext(self, loader: ConfigueLoader, node: ScalarNode) -> Any:
         path = loader.construct_scalar(node)
-        object_path_elements = path.split(".")
-        remaining_path_elements: List[str] = []
-        exceptions: list[Optional[str]] = []
-        while object_path_elements:
-            try:
-                loaded_object = loader.find_python_name(
-                    ".".join(object_path_elements),
-                    node.start_mark,
-                    unsafe=True,
-                )
-                break
-            except ConstructorError as error:
-                exceptions.append(error.problem)
-                remaining_path_elements.insert(0, object_path_elements.pop(-1))
-        else:
-            raise NotFoundError(
-                f"Could not load element {path} {node.start_mark}, encountered exceptions: {exceptions!r}"
-            ) from None
+        loaded_object, remaining_path_elements = loader.find_python_object(path, node.start_mark)
         remaining_path = ".".join(remaining_path_elements)
         if remaining_path:
             return self._get_element_at_sub_path(remaining_path, loaded_object)
@@ -0,0 +1,176 @@
+import sys
+import threading
+from collections.abc import Hashable
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple, Union, cast, overload
+
+
+class FrozenMapping(Mapping[Any, Any]):
+    """Read-only mapping whose values can also be read as attributes.
+
+    The index of the keys is shared by the frozen mappings having the same keys in the same order, each mapping only
+    stores a tuple of its values.
+    """
+
+    __slots__ = ("_indexes_by_key", "_values", "_hash")
+    _indexes_by_key: Dict[Hashable, int]
+    _values: Tuple[Any, ...]
+    _hash: Optional[int]
+
+    def __init__(self, indexes_by_key: Dict[Hashable, int], values: Tuple[Any, ...]) -> None:
+        object.__setattr__(self, "_indexes_by_key", indexes_by_key)
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "_hash", None)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._values[self._indexes_by_key[key]]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name in FrozenMapping.__slots__:
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(f"{self.__class__.__name__} has no key {name!r}") from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is read-only")
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._indexes_by_key)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._indexes_by_key
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, FrozenMapping) and self._indexes_by_key is other._indexes_by_key:
+            return self._values == other._values
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            # Equal mappings may have their keys in different orders
+            object.__setattr__(self, "_hash", hash(frozenset(self.items())))
+        return cast(int, self._hash)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (self._indexes_by_key, self._values)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+
+class FrozenSequence(Sequence[Any]):
+    """Read-only sequence backed by a tuple."""
+
+    __slots__ = ("_items",)
+    _items: Tuple[Any, ...]
+
+    def __init__(self, items: Tuple[Any, ...]) -> None:
+        object.__setattr__(self, "_items", items)
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "FrozenSequence": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return FrozenSequence(self._items[index])
+        return self._items[index]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is read-only")
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenSequence):
+            return self._items == other._items
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return self._items == tuple(other)
+
+    def __hash__(self) -> int:
+        return hash(self._items)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (self._items,)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+
+class Freezer:
+    """Convert the dicts and lists of loaded values to frozen mappings and sequences.
+
+    The identical subtrees and strings of all the values frozen by the same freezer are stored once. The keys are
+    interned, and the mappings having the same keys share the same index. The other objects (e.g. the objects
+    instantiated with ()) are kept as they are.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._canonical_values: Dict[Hashable, Any] = {}
+        self._indexes_by_keys: Dict[Tuple[Any, ...], Dict[Hashable, int]] = {}
+
+    def freeze(self, value: Any) -> Any:
+        return self._freeze(value, {})
+
+    def _freeze(self, value: Any, frozen_values_by_id: Dict[int, Tuple[Any, Any]]) -> Any:
+        if isinstance(value, str):
+            return self._get_canonical_value(_get_identity(value), value)
+        if type(value) not in (dict, list):
+            return value
+        # The values referenced several times (e.g. with !cfg) are only frozen once
+        if id(value) in frozen_values_by_id:
+            return frozen_values_by_id[id(value)][1]
+        frozen_value: Any
+        if isinstance(value, dict):
+            keys = tuple(sys.intern(key) if isinstance(key, str) else key for key in value)
+            values = tuple(self._freeze(item, frozen_values_by_id) for item in value.values())
+            frozen_value = self._get_canonical_value(
+                (FrozenMapping, tuple(map(_get_identity, keys)), tuple(map(_get_identity, values))),
+                FrozenMapping(self._get_indexes_by_key(keys), values),
+            )
+        else:
+            items = tuple(self._freeze(item, frozen_values_by_id) for item in value)
+            frozen_value = self._get_canonical_value(
+                (FrozenSequence, tuple(map(_get_identity, items))), FrozenSequence(items)
+            )
+        # The original value is kept, so that its id is not reused while freezing
+        frozen_values_by_id[id(value)] = (value, frozen_value)
+        return frozen_value
+
+    def _get_canonical_value(self, identity: Hashable, value: Any) -> Any:
+        with self._lock:
+            return self._canonical_values.setdefault(identity, value)
+
+    def _get_indexes_by_key(self, keys: Tuple[Any, ...]) -> Dict[Hashable, int]:
+        indexes_key = tuple(map(_get_identity, keys))
+        with self._lock:
+            if indexes_key not in self._indexes_by_keys:
+                self._indexes_by_keys[indexes_key] = {key: index for index, key in enumerate(keys)}
+            return self._indexes_by_keys[indexes_key]
+
+
+def _get_identity(value: Any) -> Hashable:
+    """Return a key identifying a value among the values frozen by a freezer.
+
+    The scalars are compared by value and type, so that equal values of different types (e.g. 1 and True) are not
+    merged. The other values are compared by identity: the frozen mappings and sequences are already shared when they
+    are identical, and the objects instantiated with () must not be replaced by other objects comparing equal to them.
+    The values are kept alive by the canonical values of the freezer, so their ids are not reused.
+    """
+    if value is None or type(value) in (str, int, float, bool, bytes):
+        return type(value), value
+    return id(value)
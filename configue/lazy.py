@@ -0,0 +1,80 @@
+from collections.abc import Hashable
+from reprlib import recursive_repr
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, TYPE_CHECKING, Union, overload
+
+from yaml import MappingNode, Node, SequenceNode
+
+from .configue_loader import CONSTRUCTOR_KEY, ESCAPED_CONSTRUCTOR_KEY
+
+if TYPE_CHECKING:
+    from .file_loader import FileLoader
+
+
+class LazyMapping(Mapping[Any, Any]):
+    """Read-only mapping whose values are constructed from their YAML nodes the first time they are accessed."""
+
+    def __init__(self, file_loader: "FileLoader", node: MappingNode) -> None:
+        self._file_loader = file_loader
+        self._value_nodes_by_key: Dict[Hashable, Node] = {}
+        for key_node, value_node in node.value:
+            key = file_loader.construct(key_node)
+            if key == ESCAPED_CONSTRUCTOR_KEY:
+                key = CONSTRUCTOR_KEY
+            self._value_nodes_by_key[key] = value_node
+        self._values_by_key: Dict[Hashable, Any] = {}
+
+    def __getitem__(self, key: Hashable) -> Any:
+        if key not in self._values_by_key:
+            self._values_by_key[key] = self._file_loader.construct(self._value_nodes_by_key[key], lazy=True)
+        return self._values_by_key[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._value_nodes_by_key)
+
+    def __len__(self) -> int:
+        return len(self._value_nodes_by_key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._value_nodes_by_key
+
+    @recursive_repr()
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+
+class LazySequence(Sequence[Any]):
+    """Read-only sequence whose items are constructed from their YAML nodes the first time they are accessed."""
+
+    def __init__(self, file_loader: "FileLoader", node: SequenceNode) -> None:
+        self._file_loader = file_loader
+        self._item_nodes: List[Node] = list(node.value)
+        self._items_by_index: Dict[int, Any] = {}
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Any]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[item_index] for item_index in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._item_nodes)
+        if index not in self._items_by_index:
+            self._items_by_index[index] = self._file_loader.construct(self._item_nodes[index], lazy=True)
+        return self._items_by_index[index]
+
+    def __len__(self) -> int:
+        return len(self._item_nodes)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @recursive_repr()
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
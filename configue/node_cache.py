@@ -0,0 +1,53 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from yaml import Node
+
+FileStamp = Tuple[int, int]
+
+
+def get_file_stamp(file_path: str) -> FileStamp:
+    stat_result = os.stat(file_path)
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+class NodeCache:
+    """LRU cache of composed YAML node trees, keyed by the real path of the file.
+
+    An entry is invalidated as soon as the modification time or the size of its file changes.
+    """
+
+    def __init__(self, max_size: int = 128) -> None:
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[FileStamp, Optional[Node]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_node(self, file_path: str, compose: Callable[[], Optional[Node]]) -> Optional[Node]:
+        real_path = os.path.realpath(file_path)
+        # The stamp is read before composing, so that a concurrent modification invalidates the entry
+        stamp = get_file_stamp(real_path)
+        with self._lock:
+            entry = self._entries.get(real_path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(real_path)
+                return entry[1]
+
+        node = compose()
+        with self._lock:
+            self._entries[real_path] = (stamp, node)
+            self._entries.move_to_end(real_path)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return node
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+DEFAULT_NODE_CACHE = NodeCache()
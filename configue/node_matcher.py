@@ -0,0 +1,107 @@
+from typing import Callable, Dict, Optional, Tuple, cast
+
+from yaml import MappingNode, Node, ScalarNode, SequenceNode
+
+# Return the node targeted by a !cfg node in a document, and the number of path elements walked to reach it
+CfgTargetGetter = Callable[[Node, ScalarNode], Optional[Tuple[Node, int]]]
+
+
+class UnchangedNodeMatcher:  # pylint: disable=too-many-instance-attributes
+    """Match the nodes of a new version of a document with the equivalent nodes of its previous version.
+
+    A node is unchanged if it has the same tag and value as its previous version, if all its children are unchanged, if
+    the files it imports and the nodes it references with !cfg are unchanged, and if the environment variables it uses
+    are unchanged. The objects constructed for the unchanged nodes can be reused. Mapping values are matched by key, so
+    adding or removing a key only changes the mapping itself.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        previous_root_node: Node,
+        root_node: Node,
+        is_import_unchanged: Callable[[ScalarNode], bool],
+        get_cfg_target: CfgTargetGetter,
+        *,
+        is_interpolation_unchanged: Optional[Callable[[ScalarNode], bool]] = None,
+    ) -> None:
+        self._previous_root_node = previous_root_node
+        self._root_node = root_node
+        self._is_import_unchanged = is_import_unchanged
+        self._get_cfg_target = get_cfg_target
+        self._is_interpolation_unchanged = is_interpolation_unchanged
+        self._previous_nodes_by_node: Dict[Node, Node] = {}
+        self._nodes_by_previous_node: Dict[Node, Node] = {}
+        self._is_unchanged_by_node: Dict[Node, bool] = {}
+
+    def match(self) -> Dict[Node, Node]:
+        """Return the previous version of each unchanged node."""
+        self._is_unchanged(self._previous_root_node, self._root_node)
+        return {
+            node: previous_node
+            for node, previous_node in self._previous_nodes_by_node.items()
+            if self._is_unchanged_by_node[node]
+        }
+
+    def _is_unchanged(self, previous_node: Node, node: Node) -> bool:
+        if node in self._is_unchanged_by_node or previous_node in self._nodes_by_previous_node:
+            # Each node is matched once, an anchor is only unchanged if all its aliases match the same previous node
+            return (
+                self._previous_nodes_by_node.get(node) is previous_node
+                and self._nodes_by_previous_node.get(previous_node) is node
+                and self._is_unchanged_by_node[node]
+            )
+        self._previous_nodes_by_node[node] = previous_node
+        self._nodes_by_previous_node[previous_node] = node
+        # Recursive nodes are considered as changed while their children are compared
+        self._is_unchanged_by_node[node] = False
+        if type(node) is not type(previous_node) or node.tag != previous_node.tag:
+            is_unchanged = False
+        elif isinstance(node, ScalarNode):
+            is_unchanged = self._is_scalar_unchanged(cast(ScalarNode, previous_node), node)
+        elif isinstance(node, SequenceNode):
+            # All the children are compared, so that the unchanged ones are matched even if the sequence changed
+            children_unchanged = [
+                self._is_unchanged(previous_item_node, item_node)
+                for previous_item_node, item_node in zip(previous_node.value, node.value)
+            ]
+            is_unchanged = len(node.value) == len(previous_node.value) and all(children_unchanged)
+        else:
+            is_unchanged = self._is_mapping_unchanged(cast(MappingNode, previous_node), cast(MappingNode, node))
+        self._is_unchanged_by_node[node] = is_unchanged
+        return is_unchanged
+
+    def _is_scalar_unchanged(self, previous_node: ScalarNode, node: ScalarNode) -> bool:
+        if node.value != previous_node.value or node.style != previous_node.style:
+            return False
+        if self._is_interpolation_unchanged is not None and not self._is_interpolation_unchanged(node):
+            return False
+        if node.tag.startswith("!import"):
+            return self._is_import_unchanged(node)
+        if node.tag == "!cfg":
+            previous_target = self._get_cfg_target(self._previous_root_node, previous_node)
+            target = self._get_cfg_target(self._root_node, node)
+            if previous_target is None or target is None or previous_target[1] != target[1]:
+                return False
+            return self._is_unchanged(previous_target[0], target[0])
+        return True
+
+    def _is_mapping_unchanged(self, previous_node: MappingNode, node: MappingNode) -> bool:
+        previous_items_by_key: Dict[str, Tuple[Node, Node]] = {}
+        for previous_key_node, previous_value_node in previous_node.value:
+            if isinstance(previous_key_node, ScalarNode):
+                previous_items_by_key.setdefault(previous_key_node.value, (previous_key_node, previous_value_node))
+        # All the items are compared, so that the unchanged ones are matched even if the mapping changed
+        items_unchanged = [len(node.value) == len(previous_node.value)]
+        for index, (key_node, value_node) in enumerate(node.value):
+            previous_item = previous_items_by_key.get(key_node.value) if isinstance(key_node, ScalarNode) else None
+            if previous_item is None:
+                items_unchanged.append(False)
+                continue
+            previous_key_node, previous_value_node = previous_item
+            # The keys must be in the same order, as they define the order of the constructed mapping
+            items_unchanged.append(
+                index < len(previous_node.value) and previous_node.value[index][0] is previous_key_node
+            )
+            items_unchanged.append(self._is_unchanged(previous_key_node, key_node))
+            items_unchanged.append(self._is_unchanged(previous_value_node, value_node))
+        return all(items_unchanged)
@@ -0,0 +1,27 @@
+from typing import Iterator, List, Set
+
+from yaml import MappingNode, Node, ScalarNode, SequenceNode
+
+
+def iter_nodes(root_node: Node) -> Iterator[Node]:
+    """Iterate over a node and its descendants in document order, each node being returned only once."""
+    visited_nodes: Set[Node] = set()
+    nodes_to_visit: List[Node] = [root_node]
+    while nodes_to_visit:
+        node = nodes_to_visit.pop()
+        if node in visited_nodes:
+            continue
+        visited_nodes.add(node)
+        yield node
+        if isinstance(node, SequenceNode):
+            nodes_to_visit.extend(reversed(node.value))
+        elif isinstance(node, MappingNode):
+            for key_node, value_node in reversed(node.value):
+                nodes_to_visit.append(value_node)
+                nodes_to_visit.append(key_node)
+
+
+def format_reference(node: ScalarNode) -> str:
+    """Format an !import or !cfg node and its position for error messages."""
+    mark = node.start_mark
+    return f'{node.tag} {node.value} in "{mark.name}", line {mark.line + 1}, column {mark.column + 1}'
@@ -0,0 +1,268 @@
+import array
+import marshal
+import mmap
+from collections.abc import Hashable
+from reprlib import recursive_repr
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union, cast, overload
+
+from yaml import MappingNode, Node, ScalarNode, SequenceNode
+
+from .configue_loader import CONSTRUCTOR_KEY, ESCAPED_CONSTRUCTOR_KEY, IMPLICIT_SCALAR_TAGS, PYTHON_BACKEND
+from .disk_node_cache import DiskNodeCache
+from .exceptions import SubPathNotFound
+from .file_loader import FileLoader, MAPPING_TAG, MERGE_TAG, SEQUENCE_TAG
+from .node_cache import DEFAULT_NODE_CACHE
+from .profiler import LoadProfiler
+from .root_loader import RootLoader
+
+# Kinds of the values of the preloaded mappings and sequences
+VALUE_ENTRY = 0
+MAPPING_ENTRY = 1
+SEQUENCE_ENTRY = 2
+OBJECT_ENTRY = 3
+
+# kind, then the value for VALUE_ENTRY, the index of the blob for MAPPING_ENTRY and SEQUENCE_ENTRY, the index of the
+# node to construct for OBJECT_ENTRY (None for the preloaded sub path itself)
+Entry = Tuple[int, Any]
+
+
+class PreloadedConfig:
+    """Plain data of a configuration, resolved once and stored in a shared memory buffer.
+
+    The mappings, sequences and scalars are loaded when the PreloadedConfig is created (following the !import and !cfg
+    tags and replacing the environment variables), and encoded as one compact blob per mapping or sequence in an
+    anonymous memory map. The processes forked afterwards share the buffer, which is never written again, and decode
+    each mapping or sequence the first time it is accessed. The other values (the objects instantiated with (), the
+    values of !ext, merged mappings, ...) are only constructed by the processes accessing them, once per process.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        file_path: str,
+        sub_path: Union[str, List[str]] = "",
+        *,
+        use_cache: bool = False,
+        backend: str = PYTHON_BACKEND,
+        cache_dir: Optional[str] = None,
+        prefetch_imports: bool = False,
+        profiler: Optional[LoadProfiler] = None,
+    ) -> None:
+        self._root_loader = RootLoader(
+            file_path,
+            node_cache=DEFAULT_NODE_CACHE if use_cache else None,
+            backend=backend,
+            disk_node_cache=None if cache_dir is None else DiskNodeCache(cache_dir),
+            prefetch_imports=prefetch_imports,
+            profiler=profiler,
+            thread_safe=True,
+        )
+        if isinstance(sub_path, str):
+            sub_path = sub_path.split(".")
+        self._sub_path = [sub_path_element for sub_path_element in sub_path if sub_path_element]
+        encoder = _Encoder()
+        root_node = self._root_loader.get_node(file_path, self._sub_path)
+        if root_node is None:
+            self._root_entry: Entry = (OBJECT_ENTRY, None)
+        else:
+            self._root_entry = encoder.encode(*root_node)
+        self._object_nodes = encoder.object_nodes
+        self._offsets = array.array("Q", encoder.offsets)
+        self._buffer = mmap.mmap(-1, max(len(encoder.buffer), 1))
+        self._buffer.write(encoder.buffer)
+        self._values_by_entry: Dict[Entry, Any] = {}
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the shared buffer, in bytes."""
+        return len(self._buffer)
+
+    def get(self, sub_path: Union[str, List[str]] = "") -> Any:
+        """Return a sub path of the preloaded configuration, relative to the sub path it was preloaded from.
+
+        The mappings and sequences are returned as read-only PreloadedMapping and PreloadedSequence. The sub path
+        elements are looked up as configue.load does once the values are constructed: as keys, then as integer keys or
+        indexes, then as attributes.
+
+        :raise SubPathNotFound: if an element of the sub path cannot be found.
+        """
+        if isinstance(sub_path, str):
+            sub_path = sub_path.split(".")
+        current_element = self._get_value(self._root_entry)
+        for sub_path_element in [sub_path_element for sub_path_element in sub_path if sub_path_element]:
+            if isinstance(current_element, PreloadedMapping) and sub_path_element in current_element:
+                current_element = current_element[sub_path_element]
+                continue
+            try:
+                # pylint: disable-next=protected-access
+                current_element = FileLoader._get_element_at_sub_path(sub_path_element, current_element)
+            except (KeyError, IndexError):
+                raise SubPathNotFound(f"Could not find sub_path {sub_path_element} in {current_element}") from None
+        return current_element
+
+    def _get_value(self, entry: Entry) -> Any:
+        kind, value = entry
+        if kind == VALUE_ENTRY:
+            return value
+        # The containers are decoded and the objects are constructed once, so that the shared values are the same
+        if entry not in self._values_by_entry:
+            if kind == MAPPING_ENTRY:
+                self._values_by_entry[entry] = PreloadedMapping(self, value)
+            elif kind == SEQUENCE_ENTRY:
+                self._values_by_entry[entry] = PreloadedSequence(self, value)
+            elif value is None:
+                self._values_by_entry[entry] = self._root_loader.load_root_file(self._sub_path, lazy=True)
+            else:
+                file_loader, node = self._object_nodes[value]
+                self._values_by_entry[entry] = file_loader.construct(node, lazy=True)
+        return self._values_by_entry[entry]
+
+    def _decode(self, index: int) -> List[Any]:
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else len(self._buffer)
+        return cast(List[Any], marshal.loads(self._buffer[self._offsets[index] : end]))
+
+
+class PreloadedMapping(Mapping[Any, Any]):
+    """Read-only mapping of a PreloadedConfig, decoded from the shared buffer the first time it is accessed."""
+
+    def __init__(self, preloaded_config: PreloadedConfig, index: int) -> None:
+        self._preloaded_config = preloaded_config
+        self._index = index
+        self._entries_by_key: Optional[Dict[Hashable, Entry]] = None
+
+    @property
+    def _entries(self) -> Dict[Hashable, Entry]:
+        if self._entries_by_key is None:
+            entries = self._preloaded_config._decode(self._index)  # pylint: disable=protected-access
+            self._entries_by_key = {key: (kind, value) for key, kind, value in entries}
+        return self._entries_by_key
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._preloaded_config._get_value(self._entries[key])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    @recursive_repr()
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+
+class PreloadedSequence(Sequence[Any]):
+    """Read-only sequence of a PreloadedConfig, decoded from the shared buffer the first time it is accessed."""
+
+    def __init__(self, preloaded_config: PreloadedConfig, index: int) -> None:
+        self._preloaded_config = preloaded_config
+        self._index = index
+        self._item_entries: Optional[List[Entry]] = None
+
+    @property
+    def _entries(self) -> List[Entry]:
+        if self._item_entries is None:
+            entries = self._preloaded_config._decode(self._index)  # pylint: disable=protected-access
+            self._item_entries = entries
+        return self._item_entries
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Any]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[item_index] for item_index in range(*index.indices(len(self)))]
+        return self._preloaded_config._get_value(self._entries[index])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @recursive_repr()
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+
+class _Encoder:
+    """Encode the plain data of a node tree as one marshal blob per mapping or sequence."""
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.offsets: List[int] = []
+        # Nodes of the OBJECT_ENTRY entries, with the file loaders constructing them
+        self.object_nodes: List[Tuple[FileLoader, Node]] = []
+        self._entries_by_node: Dict[Node, Entry] = {}
+        self._object_entries_by_node: Dict[Node, Entry] = {}
+        # Nodes being encoded, a node referencing one of them is constructed by the processes like the other objects
+        self._encoding_nodes: Set[Node] = set()
+
+    def encode(self, file_loader: FileLoader, node: Node) -> Entry:
+        if node in self._entries_by_node:
+            return self._entries_by_node[node]
+        if node in self._encoding_nodes:
+            return self._add_object(file_loader, node)
+        self._encoding_nodes.add(node)
+        try:
+            entry = self._encode_node(file_loader, node)
+        finally:
+            self._encoding_nodes.remove(node)
+        self._entries_by_node[node] = entry
+        return entry
+
+    def _encode_node(self, file_loader: FileLoader, node: Node) -> Entry:
+        if isinstance(node, MappingNode) and node.tag == MAPPING_TAG:
+            return self._encode_mapping(file_loader, node)
+        if isinstance(node, SequenceNode) and node.tag == SEQUENCE_TAG:
+            return SEQUENCE_ENTRY, self._add_blob([self.encode(file_loader, item_node) for item_node in node.value])
+        if isinstance(node, ScalarNode) and (node.tag == "!cfg" or node.tag.startswith("!import")):
+            referenced_node = file_loader.get_referenced_node(node)
+            if referenced_node is None:
+                return self._add_object(file_loader, node)
+            return self.encode(*referenced_node)
+        if isinstance(node, ScalarNode) and node.tag in IMPLICIT_SCALAR_TAGS:
+            value = file_loader.construct(node)
+            if _is_plain(value):
+                return VALUE_ENTRY, value
+        return self._add_object(file_loader, node)
+
+    def _encode_mapping(self, file_loader: FileLoader, node: MappingNode) -> Entry:
+        keys = []
+        for key_node, _ in node.value:
+            if key_node.tag == MERGE_TAG or key_node.value == CONSTRUCTOR_KEY:
+                return self._add_object(file_loader, node)
+            key = file_loader.construct(key_node)
+            if not _is_plain(key):
+                return self._add_object(file_loader, node)
+            keys.append(key)
+        entries = [
+            (CONSTRUCTOR_KEY if key == ESCAPED_CONSTRUCTOR_KEY else key, *self.encode(file_loader, value_node))
+            for key, (_, value_node) in zip(keys, node.value)
+        ]
+        return MAPPING_ENTRY, self._add_blob(entries)
+
+    def _add_object(self, file_loader: FileLoader, node: Node) -> Entry:
+        if node not in self._object_entries_by_node:
+            self.object_nodes.append((file_loader, node))
+            self._object_entries_by_node[node] = (OBJECT_ENTRY, len(self.object_nodes) - 1)
+        return self._object_entries_by_node[node]
+
+    def _add_blob(self, entries: List[Any]) -> int:
+        self.offsets.append(len(self.buffer))
+        self.buffer += marshal.dumps(entries)
+        return len(self.offsets) - 1
+
+
+def _is_plain(value: Any) -> bool:
+    # The environment variables replaced by YAML lists or mappings are constructed by the processes like the objects
+    return value is None or type(value) in (str, int, float, bool)
@@ -0,0 +1,79 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator, List, NamedTuple, Optional
+
+LOAD_PHASE = "load"
+PARSE_PHASE = "parse"
+IMPORT_PHASE = "import"
+CONSTRUCTOR_PHASE = "constructor"
+INTERPOLATION_PHASE = "interpolation"
+PHASES = [LOAD_PHASE, PARSE_PHASE, IMPORT_PHASE, CONSTRUCTOR_PHASE, INTERPOLATION_PHASE]
+
+
+class PhaseStats(NamedTuple):
+    call_count: int
+    # Total duration, in seconds
+    duration: float
+
+
+class LoadProfiler:
+    """Record the number and the duration of the operations done while loading a configuration.
+
+    The operations are grouped by phase, and by name in each phase:
+    - load: the sub paths loaded from the configuration
+    - parse: the files read and composed
+    - import: the files imported with !import (including their parsing and the instantiation of their objects)
+    - constructor: the callables instantiated with ()
+    - interpolation: the values containing environment variables, grouped by file
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats_by_phase: Dict[str, Dict[str, PhaseStats]] = {phase: {} for phase in PHASES}
+
+    @contextmanager
+    def measure(self, phase: str, name: str) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, name, time.perf_counter() - start_time)
+
+    def record(self, phase: str, name: str, duration: float) -> None:
+        with self._lock:
+            stats = self._stats_by_phase[phase].get(name, PhaseStats(0, 0.0))
+            self._stats_by_phase[phase][name] = PhaseStats(stats.call_count + 1, stats.duration + duration)
+
+    def get_stats(self, phase: str) -> Dict[str, PhaseStats]:
+        """Return the statistics of each operation of a phase."""
+        with self._lock:
+            return dict(self._stats_by_phase[phase])
+
+    def get_total(self, phase: str) -> PhaseStats:
+        stats = self.get_stats(phase).values()
+        return PhaseStats(sum(stat.call_count for stat in stats), sum(stat.duration for stat in stats))
+
+    def format_report(self, max_lines_per_phase: int = 10) -> str:
+        """Format the statistics of each phase, with the slowest operations first."""
+        lines: List[str] = []
+        for phase in PHASES:
+            total = self.get_total(phase)
+            lines.append(f"{phase}: {total.call_count} in {total.duration * 1000:.3f} ms")
+            sorted_stats = sorted(self.get_stats(phase).items(), key=lambda item: item[1].duration, reverse=True)
+            for name, stats in sorted_stats[:max_lines_per_phase]:
+                lines.append(f"  {name}: {stats.call_count} in {stats.duration * 1000:.3f} ms")
+        return "\n".join(lines)
+
+    def log_report(self, level: int = logging.INFO, max_lines_per_phase: int = 10) -> None:
+        self.logger.log(level, f"Configuration loading report:\n{self.format_report(max_lines_per_phase)}")
+
+
+def measure(profiler: Optional[LoadProfiler], phase: str, name: str) -> ContextManager[None]:
+    """Measure an operation if profiling is enabled."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.measure(phase, name)
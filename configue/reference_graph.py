@@ -0,0 +1,116 @@
+from typing import Dict, Iterator, List, Set, TYPE_CHECKING, Tuple, cast
+
+from yaml import Node, ScalarNode
+
+from .exceptions import ConfigueRecursionError
+from .nodes import format_reference, iter_nodes
+
+if TYPE_CHECKING:
+    from .file_loader import FileLoader
+
+# An !import or !cfg node, and the file loader constructing it
+Reference = Tuple["FileLoader", ScalarNode]
+
+
+class ReferenceGraph:
+    """Graph of the !import and !cfg references of a configuration, built from the composed nodes of its files.
+
+    A reference depends on the references contained in the node it references, as this node is constructed with all
+    its descendants. The graph is walked before constructing a sub path, to detect the recursive references and to
+    construct the references in dependency order, instead of recursively while constructing the nodes containing them.
+    """
+
+    def __init__(self) -> None:
+        # References whose dependencies were all walked, they are not walked again
+        self._walked_references: Set[Node] = set()
+        # References whose chain of references to other references was followed without finding a cycle
+        self._checked_chain_references: Set[Node] = set()
+        self._references_by_node: Dict[Node, List[Reference]] = {}
+
+    def get_construction_order(self, file_loader: "FileLoader", node: Node) -> List[Reference]:
+        """Return the references contained in a node or in the nodes it references, directly or not, each reference
+        after the references it depends on.
+
+        The references returned by a previous call are not returned again.
+
+        :raise ConfigueRecursionError: if a reference depends on itself.
+        """
+        construction_order: List[Reference] = []
+        # References being walked, each one depending on the previous one, and the iterators over their dependencies
+        walked_path: List[Reference] = []
+        walked_path_nodes: Set[Node] = set()
+        dependency_iterators: List[Iterator[Reference]] = [iter(self._get_references(file_loader, node))]
+        while dependency_iterators:
+            dependency = next(dependency_iterators[-1], None)
+            if dependency is None:
+                dependency_iterators.pop()
+                if walked_path:
+                    reference = walked_path.pop()
+                    walked_path_nodes.remove(reference[1])
+                    self._walked_references.add(reference[1])
+                    construction_order.append(reference)
+                continue
+            if dependency[1] in self._walked_references:
+                continue
+            if dependency[1] in walked_path_nodes:
+                raise ConfigueRecursionError(
+                    f"Found recursive references: {self._format_cycle(walked_path, dependency)}"
+                )
+            try:
+                referenced_node = dependency[0].get_referenced_node(dependency[1])
+            except ConfigueRecursionError:
+                raise
+            except Exception:  # pylint: disable=broad-exception-caught
+                # The reference cannot be resolved without constructing it, the error is raised by its construction
+                referenced_node = None
+            walked_path.append(dependency)
+            walked_path_nodes.add(dependency[1])
+            dependency_iterators.append(iter(self._get_references(*referenced_node) if referenced_node else []))
+        return construction_order
+
+    def check_reference_chain(self, file_loader: "FileLoader", node: ScalarNode) -> None:
+        """Follow the references referencing other references from a reference, as the lazy proxies do.
+
+        Unlike get_construction_order, the references contained in the referenced mappings and sequences are not
+        followed, as the lazy proxies only construct them on access.
+
+        :raise ConfigueRecursionError: if the chain leads back to one of its references.
+        """
+        walked_path: List[Reference] = [(file_loader, node)]
+        walked_path_nodes = {node}
+        while walked_path[-1][1] not in self._checked_chain_references:
+            try:
+                referenced_node = walked_path[-1][0].get_referenced_node(walked_path[-1][1])
+            except ConfigueRecursionError:
+                raise
+            except Exception:  # pylint: disable=broad-exception-caught
+                # The reference cannot be resolved without constructing it, the error is raised by its construction
+                break
+            if referenced_node is None or not _is_reference(referenced_node[1]):
+                break
+            dependency = (referenced_node[0], cast(ScalarNode, referenced_node[1]))
+            if dependency[1] in walked_path_nodes:
+                raise ConfigueRecursionError(
+                    f"Found recursive references: {self._format_cycle(walked_path, dependency)}"
+                )
+            walked_path.append(dependency)
+            walked_path_nodes.add(dependency[1])
+        self._checked_chain_references.update(walked_path_nodes)
+
+    def _get_references(self, file_loader: "FileLoader", node: Node) -> List[Reference]:
+        if node not in self._references_by_node:
+            self._references_by_node[node] = [
+                (file_loader, cast(ScalarNode, descendant))
+                for descendant in iter_nodes(node)
+                if _is_reference(descendant)
+            ]
+        return self._references_by_node[node]
+
+    @staticmethod
+    def _format_cycle(walked_path: List[Reference], dependency: Reference) -> str:
+        cycle_start = next(index for index, reference in enumerate(walked_path) if reference[1] is dependency[1])
+        return " -> ".join(format_reference(node) for _, node in walked_path[cycle_start:] + [dependency])
+
+
+def _is_reference(node: Node) -> bool:
+    return isinstance(node, ScalarNode) and (node.tag == "!cfg" or node.tag.startswith("!import"))
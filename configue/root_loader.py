@@ -1,28 +1,232 @@
 import logging
 import logging.config
-from typing import Any, Dict, List, Optional, Union
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
+from yaml import Node, ScalarNode
+
+from .configue_loader import PYTHON_BACKEND, get_parser_class
+from .construction_locks import ConstructionLocks
+from .disk_node_cache import DiskNodeCache
+from .env_interpolator import EnvInterpolator
 from .file_loader import FileLoader
+from .node_cache import NodeCache
+from .profiler import LoadProfiler
+from .reference_graph import ReferenceGraph
+
+PREFETCH_MAX_WORKERS = 8
 
 
-class RootLoader:
+class RootLoader:  # pylint: disable=too-many-instance-attributes
     logger = logging.getLogger(__name__)
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        file_path: str,
+        *,
+        node_cache: Optional[NodeCache] = None,
+        backend: str = PYTHON_BACKEND,
+        seek_sub_path: bool = False,
+        disk_node_cache: Optional[DiskNodeCache] = None,
+        prefetch_imports: bool = False,
+        profiler: Optional[LoadProfiler] = None,
+        thread_safe: bool = False,
+    ) -> None:
         self._root_file = file_path
+        self.node_cache = node_cache
+        self.backend = backend
+        self.seek_sub_path = seek_sub_path
+        self.disk_node_cache = disk_node_cache
+        self.prefetch_imports = prefetch_imports
+        self.profiler = profiler
+        self.construction_locks = ConstructionLocks() if thread_safe else None
+        # The environment variables are read once per load, so that all the values are consistent
+        self.env_interpolator = EnvInterpolator(dict(os.environ))
         self._file_loaders_by_file: Dict[str, FileLoader] = {}
+        self._prefetched_files: Set[str] = set()
+        self._reference_graph = ReferenceGraph()
+        # Lock of the file loaders and of the prefetched files
+        self._lock = threading.Lock()
+        # Files modified since the previous version of the configuration, and files importing them directly or not
+        self.changed_files: Set[str] = set()
+        self.affected_files: Set[str] = set()
+        # Environment variables whose values changed since the previous version of the configuration
+        self.changed_env_variables: FrozenSet[str] = frozenset()
+
+    def get_changed_files(self) -> List[str]:
+        """Return the loaded files that were modified since they were composed."""
+        return [file_path for file_path, file_loader in self._file_loaders_by_file.items() if file_loader.is_modified()]
+
+    def reload(self, changed_files: List[str]) -> "RootLoader":
+        """Create a loader for the new version of the configuration.
+
+        The files that are not in changed_files are not parsed again, and the objects of the nodes that are unchanged
+        are reused by the new loader. The environment variables are the same as in this loader.
+        """
+        root_loader = self._create_next_version(self.env_interpolator)
+        root_loader.changed_files = set(changed_files)
+        root_loader.affected_files = self._get_affected_files(changed_files)
+        self._add_next_file_loaders(root_loader)
+        return root_loader
+
+    def get_changed_env_variables(self) -> List[str]:
+        """Return the environment variables used by the constructed values whose values changed since this loader was
+        created.
+        """
+        environment = self.env_interpolator.environment
+        used_variables = {
+            variable_name
+            for file_loader in list(self._file_loaders_by_file.values())
+            for variable_names in list(file_loader.env_variables_by_node.values())
+            for variable_name in variable_names
+        }
+        return sorted(name for name in used_variables if environment.get(name) != os.environ.get(name))
+
+    def reload_environment(self, changed_variables: Iterable[str]) -> "RootLoader":
+        """Create a loader for the current values of the environment variables.
+
+        No file is parsed again, and the objects of the nodes that do not use changed_variables, directly or through
+        the nodes they reference, are reused by the new loader.
+        """
+        root_loader = self._create_next_version(EnvInterpolator(dict(os.environ)))
+        root_loader.changed_env_variables = frozenset(changed_variables)
+        root_loader.affected_files = self._get_affected_files(
+            [
+                file_path
+                for file_path, file_loader in self._file_loaders_by_file.items()
+                if file_loader.uses_env_variables(root_loader.changed_env_variables)
+            ]
+        )
+        self._add_next_file_loaders(root_loader)
+        return root_loader
+
+    def _create_next_version(self, env_interpolator: EnvInterpolator) -> "RootLoader":
+        root_loader = RootLoader(
+            self._root_file,
+            node_cache=self.node_cache,
+            backend=self.backend,
+            seek_sub_path=self.seek_sub_path,
+            disk_node_cache=self.disk_node_cache,
+            prefetch_imports=self.prefetch_imports,
+            profiler=self.profiler,
+            thread_safe=self.construction_locks is not None,
+        )
+        root_loader.env_interpolator = env_interpolator
+        return root_loader
+
+    def _add_next_file_loaders(self, root_loader: "RootLoader") -> None:
+        for file_path, file_loader in self._file_loaders_by_file.items():
+            file_loaders_by_file = root_loader._file_loaders_by_file  # pylint: disable=protected-access
+            file_loaders_by_file[file_path] = FileLoader(file_path, root_loader, file_loader)
 
-    def load_root_file(self, sub_path: Union[str, List[str]], logging_config_path: Optional[str]) -> Any:
-        if logging_config_path is not None:
-            self._load_logging_config(logging_config_path)
-        return self.load_file(self._root_file, sub_path)
+    def _get_affected_files(self, changed_files: List[str]) -> Set[str]:
+        importing_files_by_file: Dict[str, List[str]] = {}
+        for file_path, file_loader in self._file_loaders_by_file.items():
+            for imported_file in file_loader.imported_files:
+                importing_files_by_file.setdefault(imported_file, []).append(file_path)
+        affected_files = set(changed_files)
+        files_to_visit = list(changed_files)
+        while files_to_visit:
+            for importing_file in importing_files_by_file.get(files_to_visit.pop(), []):
+                if importing_file not in affected_files:
+                    affected_files.add(importing_file)
+                    files_to_visit.append(importing_file)
+        return affected_files
 
-    def _load_logging_config(self, logging_config_path: str) -> None:
+    def load_root_file(self, sub_path: Union[str, List[str]], *, lazy: bool = False) -> Any:
+        if not lazy and not self.seek_sub_path:
+            root_node = self.get_node(self._root_file, sub_path)
+            if root_node is not None:
+                self.construct_references(*root_node)
+        return self.load_file(self._root_file, sub_path, lazy=lazy)
+
+    def construct_references(
+        self, file_loader: FileLoader, node: Node, *, reference_graph: Optional[ReferenceGraph] = None
+    ) -> None:
+        """Construct the !import and !cfg nodes needed by a node, each one after the nodes it references.
+
+        The referenced nodes are then already constructed when the nodes containing them are, so that the recursion
+        depth of the construction does not grow with the length of the chains of references. The reference graph of
+        the configuration is used unless another one is given.
+        """
+        if reference_graph is None:
+            reference_graph = self._reference_graph
+        for reference_file_loader, reference in reference_graph.get_construction_order(file_loader, node):
+            reference_file_loader.construct(reference)
+
+    def check_reference_chain(self, file_loader: FileLoader, node: ScalarNode) -> None:
+        """Check that a reference constructed lazily does not lead back to itself, see ReferenceGraph."""
+        self._reference_graph.check_reference_chain(file_loader, node)
+
+    def load_root_documents(self, sub_path: Union[str, List[str]], *, lazy: bool = False) -> Iterator[Any]:
+        """Load a sub path of each document of the root file, composing a single document at a time."""
+        with open(self._root_file, encoding="utf-8") as config_file:
+            parser = get_parser_class(self.backend)(config_file)
+            try:
+                while parser.check_node():
+                    file_loader = FileLoader(self._root_file, self, document_node=parser.get_node())
+                    if not lazy:
+                        document_node = file_loader.get_node(sub_path)
+                        if document_node is not None:
+                            # Each document has its own graph, so that the previous documents are not kept in memory
+                            self.construct_references(*document_node, reference_graph=ReferenceGraph())
+                    yield file_loader.load(sub_path, lazy=lazy)
+            finally:
+                parser.dispose()
+
+    def load_logging_config(self, logging_config_path: str) -> None:
         logging.captureWarnings(True)
         logging_config = self.load_file(self._root_file, logging_config_path)
         logging.config.dictConfig(logging_config)
 
-    def load_file(self, file_path: str, sub_path: Union[str, List[str]]) -> Any:
+    def load_file(self, file_path: str, sub_path: Union[str, List[str]], *, lazy: bool = False) -> Any:
+        if self.prefetch_imports and file_path not in self._prefetched_files:
+            self._prefetch_imports(file_path)
+        return self._get_file_loader(file_path).load(sub_path, lazy=lazy)
+
+    def get_node(
+        self, file_path: str, sub_path: Union[str, List[str]], *, followed_nodes: FrozenSet[Node] = frozenset()
+    ) -> Optional[Tuple[FileLoader, Node]]:
+        """Return the node at a sub path of a file and the file loader constructing it, see FileLoader.get_node."""
+        if self.prefetch_imports and file_path not in self._prefetched_files:
+            self._prefetch_imports(file_path)
+        return self._get_file_loader(file_path).get_node(sub_path, followed_nodes=followed_nodes)
+
+    def _get_file_loader(self, file_path: str) -> FileLoader:
         if file_path not in self._file_loaders_by_file:
-            self._file_loaders_by_file[file_path] = FileLoader(file_path, self)
-        return self._file_loaders_by_file[file_path].load(sub_path)
+            with self._lock:
+                if file_path not in self._file_loaders_by_file:
+                    self._file_loaders_by_file[file_path] = FileLoader(file_path, self)
+        return self._file_loaders_by_file[file_path]
+
+    def _prefetch_imports(self, file_path: str) -> None:
+        """Compose a file and all the files it imports, directly or not, in a pool of threads.
+
+        The objects are then constructed one at a time from the composed files, in the same order as without prefetch.
+        """
+        with self._lock:
+            if file_path in self._prefetched_files:
+                return
+            self._prefetched_files.add(file_path)
+        with ThreadPoolExecutor(max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="configue-prefetch") as executor:
+            pending_futures: Set["Future[List[str]]"] = {
+                executor.submit(self._compose_file, self._get_file_loader(file_path))
+            }
+            while pending_futures:
+                done_futures, pending_futures = wait(pending_futures, return_when=FIRST_COMPLETED)
+                for done_future in done_futures:
+                    for import_path in done_future.result():
+                        with self._lock:
+                            if import_path in self._prefetched_files:
+                                continue
+                            self._prefetched_files.add(import_path)
+                        pending_futures.add(executor.submit(self._compose_file, self._get_file_loader(import_path)))
+
+    def _compose_file(self, file_loader: FileLoader) -> List[str]:
+        try:
+            return file_loader.get_static_import_paths()
+        except Exception:  # pylint: disable=broad-exception-caught
+            # The file is composed again when it is loaded, which raises the same error as without prefetch
+            return []
@@ -0,0 +1,107 @@
+from typing import Any, List, Optional, Tuple
+
+from yaml import (
+    AliasEvent,
+    DocumentEndEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    Node,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from yaml.composer import ComposerError
+
+
+class SubPathSeeker:
+    """Compose only the node at a sub path of a document, skipping the events of the other nodes.
+
+    The parser must provide the event API of yaml.parser.Parser and the compose_node method of yaml.composer.Composer.
+    """
+
+    def __init__(self, parser: Any) -> None:
+        self._parser = parser
+
+    def seek(self, path: List[str]) -> Optional[Tuple[Node, List[str]]]:
+        """Return the deepest node of the path that can be reached in the document, and the path elements left.
+
+        None is returned if the node cannot be composed on its own or if the stream contains several documents, the
+        whole stream should be composed instead. The events following the node are parsed to find the end of the stream.
+        """
+        self._parser.get_event()
+        if self._parser.check_event(StreamEndEvent):
+            return None
+        self._parser.get_event()
+
+        seek_result = self._seek_path(path)
+        if seek_result is None or not self._is_single_document():
+            return None
+        return seek_result
+
+    def _seek_path(self, path: List[str]) -> Optional[Tuple[Node, List[str]]]:
+        for index, sub_path in enumerate(path):
+            if self._parser.check_event(MappingStartEvent):
+                is_found = self._seek_mapping_key(sub_path)
+            elif self._parser.check_event(SequenceStartEvent):
+                is_found = self._seek_sequence_index(sub_path)
+            elif self._parser.check_event(ScalarEvent):
+                return self._compose_node(path[index:])
+            else:
+                return None
+            if not is_found:
+                return None
+        return self._compose_node([])
+
+    def _is_single_document(self) -> bool:
+        while not self._parser.check_event(DocumentEndEvent):
+            self._parser.get_event()
+        self._parser.get_event()
+        return bool(self._parser.check_event(StreamEndEvent))
+
+    def _seek_mapping_key(self, sub_path: str) -> bool:
+        self._parser.get_event()
+        while not self._parser.check_event(MappingEndEvent):
+            if self._parser.check_event(ScalarEvent):
+                key_event = self._parser.get_event()
+                if str(key_event.value) == sub_path:
+                    return True
+            else:
+                self._skip_node()
+            self._skip_node()
+        return False
+
+    def _seek_sequence_index(self, sub_path: str) -> bool:
+        try:
+            sub_path_index = int(sub_path)
+        except ValueError:
+            return False
+        if sub_path_index < 0:
+            return False
+        self._parser.get_event()
+        for _ in range(sub_path_index):
+            if self._parser.check_event(SequenceEndEvent):
+                return False
+            self._skip_node()
+        return not self._parser.check_event(SequenceEndEvent)
+
+    def _skip_node(self) -> None:
+        depth = 0
+        while True:
+            event = self._parser.get_event()
+            if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+                depth += 1
+            elif isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+                depth -= 1
+            if not depth:
+                return
+
+    def _compose_node(self, remaining_path: List[str]) -> Optional[Tuple[Node, List[str]]]:
+        if self._parser.check_event(AliasEvent):
+            return None
+        try:
+            node = self._parser.compose_node(None, None)
+        except ComposerError:
+            # The node contains an alias to an anchor defined outside of it
+            return None
+        return node, remaining_path
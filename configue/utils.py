@@ -1,9 +1,28 @@
-from typing import Any, List, Optional, Union
+from typing import Any, Iterable, Iterator, List, Optional, Union
 
+from .config import Config
+from .configue_loader import PYTHON_BACKEND, PYTHON_OBJECTS_BY_PATH
+from .disk_node_cache import DiskNodeCache
+from .frozen import Freezer
+from .node_cache import DEFAULT_NODE_CACHE
+from .profiler import LoadProfiler
 from .root_loader import RootLoader
 
 
-def load(file_path: str, sub_path: Union[str, List[str]] = "", *, logging_config_path: Optional[str] = None) -> Any:
+def load(  # pylint: disable=too-many-arguments
+    file_path: str,
+    sub_path: Union[str, List[str]] = "",
+    *,
+    logging_config_path: Optional[str] = None,
+    use_cache: bool = False,
+    backend: str = PYTHON_BACKEND,
+    seek_sub_path: bool = False,
+    lazy: bool = False,
+    cache_dir: Optional[str] = None,
+    prefetch_imports: bool = False,
+    profiler: Optional[LoadProfiler] = None,
+    frozen: bool = False,
+) -> Any:
     """Load configuration from a YAML file.
 
     :param file_path: Absolute path to the YAML file containing the configuration
@@ -11,6 +30,25 @@ def load(file_path: str, sub_path: Union[str, List[str]] = "", *, logging_config
     :param logging_config_path: path inside the YAML file that contains the logging configuration.
     The format is the same as logging.dictConfig():
     https://docs.python.org/3/library/logging.config.html#logging-config-dictschema
+    :param use_cache: reuse the parsed content of the files from a process-wide cache, files are parsed again only when
+    their modification time or size changes. Use configue.clear_cache() to empty the cache.
+    :param backend: "python" to parse the files with the pure Python parser, "c" to use the faster libyaml parser.
+    The pure Python parser is used if PyYAML was built without libyaml.
+    :param seek_sub_path: only compose the nodes of sub_path, skipping the rest of the file while parsing it.
+    The whole file is still composed if the nodes of sub_path contain a !cfg tag or an alias to an anchor defined
+    outside of sub_path. This has no effect when use_cache is set.
+    :param lazy: return read-only mappings and sequences that construct their values (including the objects
+    instantiated with () and the imported files) the first time they are accessed.
+    :param cache_dir: directory where a snapshot of each parsed file is stored, the snapshots are used instead of
+    parsing the files again as long as the files are not modified (even in another process).
+    :param prefetch_imports: read and parse the imported files in a pool of threads before constructing the objects.
+    The paths containing environment variables are not prefetched. This disables seek_sub_path.
+    :param profiler: configue.LoadProfiler recording the duration of the parsing of each file, of each import, of each
+    instantiation with () and of the replacement of the environment variables.
+    :param frozen: return read-only configue.frozen.FrozenMapping and FrozenSequence instead of dicts and lists, whose
+    values can also be read as attributes. The identical subtrees and strings are stored once and the keys are
+    interned, which reduces the memory used by large configurations, and the frozen values are hashable as long as
+    their objects are. This has no effect on the lazy mappings and sequences, which are already read-only.
     :return: the converting dict corresponding to the file.
 
     Taking this file as an example:
@@ -49,4 +87,96 @@ def load(file_path: str, sub_path: Union[str, List[str]] = "", *, logging_config
     Loading the sub_path ["top_level_key", "some.dotted.key"] will return "dotted.value"
     """
 
-    return RootLoader(file_path).load_root_file(sub_path, logging_config_path)
+    config = Config(
+        file_path,
+        logging_config_path=logging_config_path,
+        use_cache=use_cache,
+        backend=backend,
+        seek_sub_path=seek_sub_path,
+        cache_dir=cache_dir,
+        prefetch_imports=prefetch_imports,
+        profiler=profiler,
+        thread_safe=False,
+    )
+    return config.get(sub_path, lazy=lazy, frozen=frozen)
+
+
+def load_many(  # pylint: disable=too-many-arguments
+    file_path: str,
+    sub_paths: Iterable[Union[str, List[str]]],
+    *,
+    logging_config_path: Optional[str] = None,
+    use_cache: bool = False,
+    backend: str = PYTHON_BACKEND,
+    seek_sub_path: bool = False,
+    lazy: bool = False,
+    cache_dir: Optional[str] = None,
+    prefetch_imports: bool = False,
+    profiler: Optional[LoadProfiler] = None,
+    frozen: bool = False,
+) -> List[Any]:
+    """Load several sub paths of a YAML file.
+
+    The files are parsed once for all the sub paths, and the objects referenced from several sub paths (e.g. with
+    !cfg) are only instantiated once. The parameters are the same as the ones of configue.load, seek_sub_path is
+    ignored when several sub paths are loaded since their objects could not be shared.
+
+    :return: the objects loaded from each sub path, in the same order as sub_paths.
+    """
+    sub_path_list = list(sub_paths)
+    config = Config(
+        file_path,
+        logging_config_path=logging_config_path,
+        use_cache=use_cache,
+        backend=backend,
+        seek_sub_path=seek_sub_path and len(sub_path_list) <= 1,
+        cache_dir=cache_dir,
+        prefetch_imports=prefetch_imports,
+        profiler=profiler,
+        thread_safe=False,
+    )
+    return [config.get(sub_path, lazy=lazy, frozen=frozen) for sub_path in sub_path_list]
+
+
+def load_all(  # pylint: disable=too-many-arguments
+    file_path: str,
+    sub_path: Union[str, List[str]] = "",
+    *,
+    use_cache: bool = False,
+    backend: str = PYTHON_BACKEND,
+    lazy: bool = False,
+    cache_dir: Optional[str] = None,
+    prefetch_imports: bool = False,
+    profiler: Optional[LoadProfiler] = None,
+    frozen: bool = False,
+) -> Iterator[Any]:
+    """Load each document of a multi-document YAML file.
+
+    The documents are parsed and loaded one at a time, so that only one document is kept in memory while iterating.
+    !cfg paths are relative to the document containing them, the imported files are shared by all the documents.
+    use_cache and cache_dir only apply to the imported files, and the frozen values only share their identical subtrees
+    within each document, so that the previous documents are not kept in memory. The other parameters are the same as
+    the ones of configue.load.
+
+    :return: an iterator over the objects loaded from sub_path in each document.
+    """
+    root_loader = RootLoader(
+        file_path,
+        node_cache=DEFAULT_NODE_CACHE if use_cache else None,
+        backend=backend,
+        disk_node_cache=None if cache_dir is None else DiskNodeCache(cache_dir),
+        prefetch_imports=prefetch_imports,
+        profiler=profiler,
+    )
+    documents = root_loader.load_root_documents(sub_path, lazy=lazy)
+    if frozen:
+        return (Freezer().freeze(document) for document in documents)
+    return documents
+
+
+def clear_cache() -> None:
+    """Empty the process-wide caches of parsed files (used with use_cache=True) and of the Python objects loaded
+    with () and !ext.
+    """
+    DEFAULT_NODE_CACHE.clear()
+    PYTHON_OBJECTS_BY_PATH.clear()
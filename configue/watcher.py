@@ -0,0 +1,71 @@
+import logging
+import threading
+from types import TracebackType
+from typing import Callable, List, Optional, Type
+
+from .config import Config
+
+
+class ConfigWatcher:
+    """Reload a configuration in a background thread when its files are modified.
+
+    The modification time and the size of the loaded files (including the imported files) are polled every interval
+    seconds. After each reload, the subscribers are called with the paths of the modified files.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, config: Config, interval: float = 1.0) -> None:
+        self._config = config
+        self._interval = interval
+        self._callbacks: List[Callable[[List[str]], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[List[str]], None]) -> None:
+        self._callbacks.append(callback)
+
+    def poll(self) -> List[str]:
+        """Reload the configuration if needed and notify the subscribers.
+
+        :return: the paths of the modified files.
+        """
+        changed_files = self._config.reload()
+        if changed_files:
+            for callback in self._callbacks:
+                callback(changed_files)
+        return changed_files
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="configue-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.poll()
+            except Exception:  # pylint: disable=broad-exception-caught
+                # The previous version of the configuration is kept until the files can be loaded again
+                self.logger.exception("Could not reload the configuration")
+
+    def __enter__(self) -> "ConfigWatcher":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
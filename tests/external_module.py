@@ -1,5 +1,9 @@
+import asyncio
+import threading
+import time
 from enum import Enum
 from logging import Handler, LogRecord
+from typing import Any
 
 
 class MyObject:
@@ -29,3 +33,42 @@ class Static:
     @staticmethod
     def get_static_value():
         return "foo"
+
+
+class InstanceCounter:
+    instance_count = 0
+
+    def __init__(self, **kwargs):
+        InstanceCounter.instance_count += 1
+        self.kwargs = kwargs
+
+
+class SlowObject:
+    instance_count = 0
+    lock = threading.Lock()
+
+    def __init__(self, **kwargs):
+        # Let the other threads run while the object is instantiated
+        time.sleep(0.001)
+        with SlowObject.lock:
+            SlowObject.instance_count += 1
+        self.kwargs = kwargs
+
+
+class AsyncObject:
+    def __init__(self, event_loop: asyncio.AbstractEventLoop, **kwargs: Any) -> None:
+        self.event_loop = event_loop
+        self.kwargs = kwargs
+
+
+async def create_async_object(**kwargs):
+    await asyncio.sleep(0)
+    return AsyncObject(asyncio.get_running_loop(), **kwargs)
+
+
+EVENT = threading.Event()
+
+
+def wait_for_event():
+    # Only set by the event loop if it is not blocked while the configuration is loaded
+    return EVENT.wait(timeout=5)
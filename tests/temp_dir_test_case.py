@@ -0,0 +1,22 @@
+import os
+import tempfile
+from unittest import TestCase
+
+
+class TempDirTestCase(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self._temp_dir.cleanup)
+
+    def _get_path(self, file_name: str) -> str:
+        return os.path.join(self._temp_dir.name, file_name)
+
+    def _write_file(self, file_name: str, content: str) -> str:
+        file_path = self._get_path(file_name)
+        stamp = os.stat(file_path).st_mtime_ns if os.path.exists(file_path) else None
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(content)
+        if stamp is not None:
+            # Make sure the modification is detected on file systems with a coarse time resolution
+            os.utime(file_path, ns=(stamp + 1_000_000_000, stamp + 1_000_000_000))
+        return file_path
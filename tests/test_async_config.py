@@ -0,0 +1,80 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+import configue
+from tests.external_module import AsyncObject, EVENT, InstanceCounter
+from tests.temp_dir_test_case import TempDirTestCase
+
+CONFIG_CONTENT = """async_object:
+  (): tests.external_module.create_async_object
+  name: async
+blocking: !ext tests.external_module.wait_for_event
+counter:
+  (): tests.external_module.InstanceCounter
+  async_object: !cfg async_object
+imported: !import imported.yml
+"""
+
+
+class TestAsyncConfig(TempDirTestCase, IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        InstanceCounter.instance_count = 0
+        EVENT.clear()
+        self._file_path = self._write_file("config.yml", CONFIG_CONTENT)
+        self._write_file("imported.yml", "key: value\n")
+
+    async def test_aload(self):
+        file_path = os.path.join(os.path.dirname(__file__), "test_file_4.yml")
+        items = await configue.aload(file_path, "modules.items")
+        self.assertEqual("item", items[0])
+        self.assertEqual("enabled", items[1].kwargs["name"])
+        self.assertEqual(["nested_item"], items[2])
+
+    async def test_aload_awaits_async_factories_on_event_loop(self):
+        async_object = await configue.aload(self._file_path, "async_object")
+        self.assertIsInstance(async_object, AsyncObject)
+        self.assertIs(asyncio.get_running_loop(), async_object.event_loop)
+        self.assertEqual({"name": "async"}, async_object.kwargs)
+
+    async def test_aload_does_not_block_event_loop(self):
+        asyncio.get_running_loop().call_soon(EVENT.set)
+        wait_for_event = await configue.aload(self._file_path, "blocking")
+        self.assertTrue(wait_for_event())
+
+    async def test_aload_with_executor(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            counter = await configue.aload(self._file_path, "counter", executor=executor)
+        self.assertIsInstance(counter.kwargs["async_object"], AsyncObject)
+
+    async def test_get_shares_instances_between_concurrent_calls(self):
+        config = configue.AsyncConfig(self._file_path)
+        counters = await asyncio.gather(*(config.get("counter") for _ in range(10)))
+        self.assertEqual(1, InstanceCounter.instance_count)
+        self.assertTrue(all(counter is counters[0] for counter in counters))
+        self.assertIs(counters[0].kwargs["async_object"], await config.get("async_object"))
+        self.assertEqual("value", await config.get("imported.key"))
+
+    async def test_reload(self):
+        config = configue.AsyncConfig(self._file_path)
+        counter = await config.get("counter")
+        self.assertEqual([], await config.reload())
+
+        self._write_file("imported.yml", "key: other_value\n")
+        self.assertEqual([self._get_path("imported.yml")], await config.reload())
+        self.assertEqual("other_value", await config.get("imported.key"))
+        self.assertIs(counter, await config.get("counter"))
+
+    async def test_reload_environment(self):
+        self._write_file("imported.yml", "key: ${CONFIGUE_ASYNC_KEY-value}\n")
+        config = configue.AsyncConfig(self._file_path)
+        counter = await config.get("counter")
+        with patch.dict(os.environ, {"CONFIGUE_ASYNC_KEY": "other_value"}):
+            self.assertEqual([], await config.reload_environment())
+            self.assertEqual("value", await config.get("imported.key"))
+            self.assertEqual(["CONFIGUE_ASYNC_KEY"], await config.reload_environment())
+        self.assertEqual("other_value", await config.get("imported.key"))
+        self.assertIs(counter, await config.get("counter"))
@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks.generator import ConfigShape, generate_config, get_value_paths
+from benchmarks.run import main, run_benchmarks
+
+import configue
+
+
+class TestBenchmarks(TestCase):
+    def test_generate_config(self):
+        shape = ConfigShape(width=3, depth=2, imports=2, env_ratio=0.5, constructors=2)
+        with tempfile.TemporaryDirectory() as temp_dir, patch.dict(os.environ, {"CONFIGUE_BENCHMARK_VAR_0": "env"}):
+            config = configue.load(generate_config(temp_dir, shape))
+        self.assertEqual("env", config["key_0"]["key_0"])
+        self.assertEqual("value_1_1", config["key_1"]["key_1"])
+        self.assertEqual("imported_1_2_1", config["import_1"]["key_2"]["key_1"])
+        self.assertEqual(1, config["objects"]["object_1"].index)
+        self.assertEqual(9, len(get_value_paths(shape)))
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks({"tiny": ConfigShape(width=2, depth=2, imports=1, env_ratio=1, constructors=1)}, 1)
+        self.assertEqual(
+            ["init", "parse", "lookup", "interpolate", "construct", "load"], [result.phase for result in results]
+        )
+        self.assertTrue(all(result.duration > 0 and result.peak_memory > 0 for result in results))
+        self.assertNotIn("CONFIGUE_BENCHMARK_VAR_0", os.environ)
+
+    def test_main_saves_and_compares_results(self):
+        with (
+            tempfile.TemporaryDirectory() as temp_dir,
+            patch.dict("benchmarks.run.SCENARIOS", {"tiny": ConfigShape(width=2, depth=2)}),
+            patch("builtins.print") as print_mock,
+        ):
+            results_path = os.path.join(temp_dir, "results.json")
+            main(["tiny", "--repeat", "1", "--save", results_path])
+            main(["tiny", "--repeat", "1", "--compare", results_path])
+            with open(results_path, encoding="utf-8") as results_file:
+                self.assertEqual(6, len(json.load(results_file)))
+        self.assertTrue(print_mock.call_args[0][0].splitlines()[1].endswith("x"))
+
+    def test_main_with_unknown_scenario(self):
+        with self.assertRaises(SystemExit), patch("sys.stderr"):
+            main(["unknown"])
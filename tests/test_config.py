@@ -0,0 +1,313 @@
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from typing import Any, Dict, List
+from unittest import TestCase
+from unittest.mock import patch
+
+import yaml
+
+import configue
+from configue.file_loader import FileLoader
+from tests.external_module import InstanceCounter, SlowObject
+from tests.temp_dir_test_case import TempDirTestCase
+
+CONFIG_CONTENT = """first:
+  (): tests.external_module.InstanceCounter
+  name: first
+second:
+  (): tests.external_module.InstanceCounter
+  name: second
+shortcut: !cfg first
+imported: !import imported.yml
+"""
+
+
+class TestConfig(TestCase):
+    def setUp(self) -> None:
+        InstanceCounter.instance_count = 0
+        self._file_path = os.path.join(os.path.dirname(__file__), "test_file_4.yml")
+
+    def test_get_shares_instances_between_sub_paths(self):
+        config = configue.Config(self._file_path)
+        enabled = config.get("modules.enabled")
+        self.assertIs(enabled, config.get("modules.shortcut"))
+        self.assertIs(enabled, config.get(["modules", "items", "1"]))
+        self.assertEqual(1, InstanceCounter.instance_count)
+
+    def test_get_parses_each_file_once(self):
+        compose = FileLoader._compose  # pylint: disable=protected-access
+        with patch.object(FileLoader, "_compose", autospec=True, side_effect=compose) as compose_mock:
+            config = configue.Config(self._file_path)
+            config.get("modules.imported.key1")
+            config.get("modules.imported.key2")
+            config.get("modules.enabled")
+        self.assertEqual(2, compose_mock.call_count)
+
+    def test_get_with_lazy(self):
+        modules = configue.Config(self._file_path).get("modules", lazy=True)
+        self.assertEqual("enabled", modules["enabled"].kwargs["name"])
+        self.assertEqual(1, InstanceCounter.instance_count)
+
+    def test_load_many(self):
+        enabled, shortcut, item = configue.load_many(
+            self._file_path, ["modules.enabled", "modules.shortcut", "modules.items.0"]
+        )
+        self.assertIs(enabled, shortcut)
+        self.assertEqual("item", item)
+        self.assertEqual(1, InstanceCounter.instance_count)
+
+    def test_load_many_with_seek_sub_path_shares_instances(self):
+        enabled, shortcut = configue.load_many(self._file_path, ["modules.enabled", "modules"], seek_sub_path=True)
+        self.assertIs(enabled, shortcut["enabled"])
+
+    def test_get_with_seek_sub_path_does_not_share_first_sub_path(self):
+        config = configue.Config(self._file_path, seek_sub_path=True)
+        enabled = config.get("modules.enabled")
+        modules = config.get("modules")
+        self.assertIsNot(enabled, modules["enabled"])
+        self.assertIs(modules["enabled"], config.get("modules.shortcut"))
+
+
+class TestConfigReload(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self._file_path = self._write_file("config.yml", CONFIG_CONTENT)
+        self._write_file("imported.yml", "key:\n  (): tests.external_module.InstanceCounter\nother_key: [value]\n")
+
+    def test_reload_without_modification(self):
+        config = configue.Config(self._file_path)
+        result = config.get()
+        self.assertEqual([], config.reload())
+        self.assertIs(result, config.get())
+
+    def test_reload_without_modification_with_seek_sub_path(self):
+        self._write_file("config.yml", CONFIG_CONTENT + "imported_key: !import:key imported.yml\n")
+        config = configue.Config(self._file_path, seek_sub_path=True)
+        config.get("imported_key")
+        first = config.get("first")
+        # The files that were only sought are not reported as modified
+        self.assertEqual([], config.reload())
+        self.assertIs(first, config.get("first"))
+
+    def test_reload_reuses_unchanged_objects(self):
+        config = configue.Config(self._file_path)
+        result = config.get()
+        self._write_file("config.yml", self._read_file("config.yml").replace("name: second", "name: new_second"))
+        self.assertEqual([self._file_path], config.reload())
+        new_result = config.get()
+        self.assertIsNot(result, new_result)
+        self.assertIs(result["first"], new_result["first"])
+        self.assertIs(new_result["first"], new_result["shortcut"])
+        self.assertIs(result["imported"], new_result["imported"])
+        self.assertEqual("new_second", new_result["second"].kwargs["name"])
+
+    def test_reload_instantiates_objects_referencing_modified_nodes(self):
+        config = configue.Config(self._file_path)
+        result = config.get()
+        self._write_file("config.yml", self._read_file("config.yml").replace("name: first", "name: new_first"))
+        config.reload()
+        new_result = config.get()
+        self.assertIsNot(result["first"], new_result["first"])
+        self.assertIs(new_result["first"], new_result["shortcut"])
+        self.assertIs(result["second"], new_result["second"])
+
+    def test_reload_with_added_key_reuses_other_values(self):
+        config = configue.Config(self._file_path)
+        result = config.get()
+        self._write_file("config.yml", "new_key: value\n" + self._read_file("config.yml"))
+        config.reload()
+        new_result = config.get()
+        self.assertEqual("value", new_result["new_key"])
+        self.assertIs(result["first"], new_result["first"])
+        self.assertIs(result["second"], new_result["second"])
+
+    def test_reload_with_modified_import(self):
+        config = configue.Config(self._file_path)
+        first, imported = config.get("first"), config.get("imported")
+        compose = FileLoader._compose  # pylint: disable=protected-access
+        self._write_file("imported.yml", self._read_file("imported.yml").replace("[value]", "[new_value]"))
+        with patch.object(FileLoader, "_compose", autospec=True, side_effect=compose) as compose_mock:
+            self.assertEqual([self._get_path("imported.yml")], config.reload())
+        self.assertEqual(1, compose_mock.call_count)
+        new_imported = config.get("imported")
+        self.assertIsNot(imported, new_imported)
+        self.assertIs(imported["key"], new_imported["key"])
+        self.assertEqual(["new_value"], new_imported["other_key"])
+        self.assertIs(first, config.get("first"))
+
+    def test_reload_keeps_previous_version_on_error(self):
+        config = configue.Config(self._file_path)
+        first = config.get("first")
+        self._write_file("config.yml", "first: [")
+        with self.assertRaises(yaml.YAMLError):
+            config.reload()
+        self.assertIs(first, config.get("first"))
+
+    def test_reload_with_lazy(self):
+        config = configue.Config(self._file_path)
+        first = config.get("first", lazy=True)
+        self._write_file("config.yml", self._read_file("config.yml").replace("name: second", "name: new_second"))
+        config.reload()
+        self.assertIs(first, config.get("first", lazy=True))
+        self.assertEqual("new_second", config.get("second", lazy=True).kwargs["name"])
+
+    def test_reload_environment_reuses_objects_not_using_modified_variables(self):
+        self._write_file(
+            "config.yml",
+            CONFIG_CONTENT.replace("name: first", "name: ${CONFIGUE_FIRST_NAME}")
+            + "host: ${CONFIGUE_HOST-localhost}\nshortcut_list: [!cfg shortcut]\n",
+        )
+        with patch.dict(os.environ, {"CONFIGUE_FIRST_NAME": "first"}):
+            config = configue.Config(self._file_path)
+            result = config.get()
+        with patch.dict(os.environ, {"CONFIGUE_FIRST_NAME": "new_first", "CONFIGUE_HOST": "new_host"}):
+            self.assertEqual(["CONFIGUE_FIRST_NAME"], config.reload_environment(["CONFIGUE_FIRST_NAME"]))
+        new_result = config.get()
+        self.assertEqual("new_first", new_result["first"].kwargs["name"])
+        self.assertIs(new_result["first"], new_result["shortcut"])
+        self.assertIs(new_result["first"], new_result["shortcut_list"][0])
+        self.assertIs(result["second"], new_result["second"])
+        self.assertIs(result["imported"], new_result["imported"])
+        # The values using other variables are reused, even if these variables were modified
+        self.assertEqual("localhost", new_result["host"])
+
+    def test_reload_environment_detects_modified_variables(self):
+        self._write_file("imported.yml", "key: ${CONFIGUE_KEY}\nother_key: [value]\n")
+        with patch.dict(os.environ, {"CONFIGUE_KEY": "value", "CONFIGUE_OTHER": "value"}):
+            config = configue.Config(self._file_path)
+            result = config.get()
+            self.assertEqual([], config.reload_environment())
+        with patch.dict(os.environ, {"CONFIGUE_KEY": "new_value", "CONFIGUE_OTHER": "new_value"}):
+            self.assertEqual(["CONFIGUE_KEY"], config.reload_environment())
+        new_result = config.get()
+        self.assertEqual("new_value", new_result["imported"]["key"])
+        self.assertIs(result["imported"]["other_key"], new_result["imported"]["other_key"])
+        self.assertIs(result["first"], new_result["first"])
+
+    def test_reload_environment_with_variable_in_import_path(self):
+        self._write_file("config.yml", CONFIG_CONTENT.replace("imported.yml", "${CONFIGUE_IMPORTED-imported}.yml"))
+        self._write_file("other.yml", "key: other_value\n")
+        config = configue.Config(self._file_path)
+        result = config.get()
+        with patch.dict(os.environ, {"CONFIGUE_IMPORTED": "other"}):
+            self.assertEqual(["CONFIGUE_IMPORTED"], config.reload_environment())
+        new_result = config.get()
+        self.assertEqual({"key": "other_value"}, new_result["imported"])
+        self.assertIs(result["first"], new_result["first"])
+
+    def test_reload_environment_with_nested_variables(self):
+        self._write_file("config.yml", "key: ${CONFIGUE_OUTER}\nother_key: [value]\n")
+        with patch.dict(os.environ, {"CONFIGUE_OUTER": '["${CONFIGUE_INNER}"]', "CONFIGUE_INNER": "value"}):
+            config = configue.Config(self._file_path)
+            result = config.get()
+        with patch.dict(os.environ, {"CONFIGUE_OUTER": '["${CONFIGUE_INNER}"]', "CONFIGUE_INNER": "new_value"}):
+            self.assertEqual(["CONFIGUE_INNER"], config.reload_environment())
+        new_result = config.get()
+        self.assertEqual(["new_value"], new_result["key"])
+        self.assertIs(result["other_key"], new_result["other_key"])
+
+    def _read_file(self, file_name: str) -> str:
+        with open(self._get_path(file_name), encoding="utf-8") as file:
+            return file.read()
+
+
+class TestConfigThreadSafety(TempDirTestCase):
+    thread_count = 16
+    module_count = 30
+
+    def setUp(self) -> None:
+        super().setUp()
+        lines = ["modules:"]
+        for module_index in range(self.module_count):
+            lines.extend([f"  module_{module_index}:", "    (): tests.external_module.SlowObject"])
+            if module_index:
+                # Each module depends on the previous one, so that the threads wait for each other
+                lines.append(f"    dependency: !cfg modules.module_{module_index - 1}")
+            lines.append("    shared: !import:shared shared.yml")
+        lines.append("shortcuts: [!cfg modules.module_0, !cfg modules.module_1]")
+        self._file_path = self._write_file("config.yml", "\n".join(lines))
+        self._write_file("shared.yml", "shared:\n  (): tests.external_module.SlowObject\n")
+        self._sub_paths = [f"modules.module_{index}" for index in range(self.module_count)] + ["shortcuts", ""]
+
+    def test_get_from_several_threads(self):
+        for _ in range(5):
+            SlowObject.instance_count = 0
+            self._assert_consistent_results(self._get_from_threads(configue.Config(self._file_path)))
+            self.assertEqual(self.module_count + 1, SlowObject.instance_count)
+
+    def test_get_merged_keys_from_several_threads(self):
+        lines = ["first: &first {" + ", ".join(f"key_{index}: {index}" for index in range(10)) + "}"]
+        lines.append("second: &second {other_key: value}")
+        lines.append("merged:")
+        for module_index in range(self.module_count):
+            lines.extend([f"  module_{module_index}:", "    <<: [*first, *second]", f"    own_key: {module_index}"])
+        file_path = self._write_file("merged.yml", "\n".join(lines))
+        self._sub_paths = [
+            sub_path
+            for module_index in range(self.module_count)
+            for sub_path in [f"merged.module_{module_index}", f"merged.module_{module_index}.key_5"]
+        ]
+        # Switch threads often, so that the mappings are walked while other threads flatten them
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+        for _ in range(10):
+            results = self._get_from_threads(configue.Config(file_path))
+            self.assertTrue(all(result_objects["merged.module_0.key_5"] == 5 for result_objects in results))
+
+    def test_get_from_several_threads_with_lazy_and_prefetch(self):
+        SlowObject.instance_count = 0
+        config = configue.Config(self._file_path, prefetch_imports=True)
+        results = self._get_from_threads(config, lazy=True)
+        self.assertEqual(self.module_count + 1, SlowObject.instance_count)
+        objects = {id(result_objects["modules.module_2"]) for result_objects in results}
+        self.assertEqual(1, len(objects))
+
+    def test_get_from_several_threads_parses_files_once(self):
+        compose_counts: Counter[str] = Counter()
+        compose = FileLoader._compose  # pylint: disable=protected-access
+        lock = threading.Lock()
+
+        def compose_mock(file_loader: FileLoader) -> Any:
+            with lock:
+                compose_counts[file_loader._file_path] += 1  # pylint: disable=protected-access
+            return compose(file_loader)
+
+        with patch.object(FileLoader, "_compose", compose_mock):
+            self._get_from_threads(configue.Config(self._file_path))
+        self.assertEqual([1, 1], list(compose_counts.values()))
+
+    def _get_from_threads(self, config: configue.Config, lazy: bool = False) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = [{} for _ in range(self.thread_count)]
+        errors: List[BaseException] = []
+        barrier = threading.Barrier(self.thread_count)
+
+        def get_sub_paths(thread_index: int) -> None:
+            sub_paths = list(self._sub_paths)
+            random.Random(thread_index).shuffle(sub_paths)
+            barrier.wait()
+            try:
+                for sub_path in sub_paths:
+                    results[thread_index][sub_path] = config.get(sub_path, lazy=lazy)
+            except BaseException as error:  # pylint: disable=broad-exception-caught
+                errors.append(error)
+
+        threads = [threading.Thread(target=get_sub_paths, args=(index,)) for index in range(self.thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        return results
+
+    def _assert_consistent_results(self, results: List[Dict[str, Any]]) -> None:
+        for sub_path in self._sub_paths:
+            self.assertEqual(1, len({id(result_objects[sub_path]) for result_objects in results}), sub_path)
+        result = results[0][""]
+        for module_index in range(1, self.module_count):
+            module = result["modules"][f"module_{module_index}"]
+            self.assertIs(result["modules"][f"module_{module_index - 1}"], module.kwargs["dependency"])
+            self.assertIs(result["modules"]["module_0"].kwargs["shared"], module.kwargs["shared"])
+        self.assertIs(result["modules"]["module_1"], result["shortcuts"][1])
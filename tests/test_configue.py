@@ -1,18 +1,37 @@
 import logging
 import os
-from unittest import TestCase
+import tempfile
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, List, Union
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+import yaml
 
 import configue
-from configue.exceptions import ConfigueError, NonCallableError, SubPathNotFound, NotFoundError
-from tests.external_module import CONSTANT, MyObject, Color
+from configue.configue_loader import CParser, ConfigueLoader, PYTHON_OBJECTS_BY_PATH, get_parser_class
+from configue.file_loader import FileLoader
+from configue.exceptions import (
+    ConfigueError,
+    ConfigueRecursionError,
+    NonCallableError,
+    SubPathNotFound,
+    NotFoundError,
+    UnknownBackendError,
+)
+from tests.external_module import CONSTANT, MyObject, Color, InstanceCounter
+from tests.temp_dir_test_case import TempDirTestCase
 
 
 class TestConfigue(TestCase):
+    load_options: Dict[str, Any] = {}
+
     def tearDown(self) -> None:
         os.environ.pop("ENV_VAR", None)
 
     def test_load_file_shares_object_instances(self):
-        result = configue.load(self._get_path("test_file_1.yml"), "key1")
+        result = self._load(self._get_path("test_file_1.yml"), "key1")
         self.assertIs(result["subkey1"], result["subkey4"]["subkey5"])
         self.assertIsInstance(result["subkey1"], dict)
         self.assertIs(result["subkey1"], result["subkey4"]["subkey6"])
@@ -24,15 +43,15 @@ class TestConfigue(TestCase):
         self.assertIsInstance(result["subkey3"], list)
 
     def test_load_deep_path(self):
-        result = configue.load(self._get_path("test_file_1.yml"), "key1.subkey3.1")
+        result = self._load(self._get_path("test_file_1.yml"), "key1.subkey3.1")
         self.assertEqual("item2", result)
 
     def test_load_list_path(self):
-        result = configue.load(self._get_path("test_file_1.yml"), ["key1", "sub.key.5"])
+        result = self._load(self._get_path("test_file_1.yml"), ["key1", "sub.key.5"])
         self.assertEqual("final_value", result)
 
     def test_load_with_env_vars(self):
-        result = configue.load(self._get_path("test_file_1.yml"), "env")
+        result = self._load(self._get_path("test_file_1.yml"), "env")
         self.assertEqual(
             {
                 "env_key1": None,
@@ -49,7 +68,7 @@ class TestConfigue(TestCase):
             result,
         )
         os.environ["ENV_VAR"] = "my_value"
-        result = configue.load(self._get_path("test_file_1.yml"), "env")
+        result = self._load(self._get_path("test_file_1.yml"), "env")
         self.assertEqual(
             {
                 "env_key1": "my_value",
@@ -66,7 +85,7 @@ class TestConfigue(TestCase):
             result,
         )
         os.environ["ENV_VAR"] = "321"
-        result = configue.load(self._get_path("test_file_1.yml"), "env")
+        result = self._load(self._get_path("test_file_1.yml"), "env")
         self.assertEqual(
             {
                 "env_key1": 321,
@@ -84,7 +103,7 @@ class TestConfigue(TestCase):
         )
         os.environ["ENV_VAR"] = "${ENV_VAR_2}-${ENV_VAR_2}"
         os.environ["ENV_VAR_2"] = "123"
-        result = configue.load(self._get_path("test_file_1.yml"), "env")
+        result = self._load(self._get_path("test_file_1.yml"), "env")
         self.assertEqual(
             {
                 "env_key1": "123-123",
@@ -101,9 +120,23 @@ class TestConfigue(TestCase):
             result,
         )
 
+    def test_load_with_env_var_containing_yaml(self):
+        os.environ["ENV_VAR"] = "[1, two]"
+        result = self._load(self._get_path("test_file_1.yml"), "env")
+        self.assertEqual([1, "two"], result["env_key1"])
+        self.assertEqual("[1, two]", result["env_key7"])
+
+    def test_load_with_env_vars_does_not_parse_simple_values(self):
+        os.environ["ENV_VAR"] = "321"
+        with patch("configue.configue_loader.yaml.load") as load_mock:
+            result = self._load(self._get_path("test_file_1.yml"), "env")
+        load_mock.assert_not_called()
+        self.assertEqual(321, result["env_key1"])
+        self.assertEqual("321", result["env_key3"])
+
     def test_load_with_imports(self):
         os.environ["ENV_VAR"] = "test_file_1"
-        result = configue.load(self._get_path("test_file_2.yml"), "key1")
+        result = self._load(self._get_path("test_file_2.yml"), "key1")
         self.assertIs(result["value1"], result["value2"])
         self.assertIs(result["value1"], result["value3"])
         self.assertEqual("other_value", result["value1"]["key1"]["subkey1"]["other_key"])
@@ -111,84 +144,237 @@ class TestConfigue(TestCase):
         self.assertIsNone(result["value7"])
 
     def test_load_without_path(self):
-        result = configue.load(self._get_path("test_file_1.yml"))
+        result = self._load(self._get_path("test_file_1.yml"))
         self.assertCountEqual(["key1", "key2", "env"], result.keys())
 
     def test_load_with_invalid_class_raises_exception(self):
         with self.assertRaises(NonCallableError):
-            configue.load(self._get_path("test_file_2.yml"), "invalid_class")
+            self._load(self._get_path("test_file_2.yml"), "invalid_class")
 
     def test_load_invalid_subpath_raises_exception(self):
         with self.assertRaises(SubPathNotFound):
-            configue.load(self._get_path("test_file_1.yml"), "key1.subkey1.other_key.unknown_key")
+            self._load(self._get_path("test_file_1.yml"), "key1.subkey1.other_key.unknown_key")
 
         with self.assertRaises(SubPathNotFound):
-            configue.load(self._get_path("test_file_1.yml"), "key1.subkey1.unknown_key")
+            self._load(self._get_path("test_file_1.yml"), "key1.subkey1.unknown_key")
 
         with self.assertRaises(SubPathNotFound):
-            configue.load(self._get_path("test_file_1.yml"), "key1.subkey3.3")
+            self._load(self._get_path("test_file_1.yml"), "key1.subkey3.3")
 
         with self.assertRaises(SubPathNotFound):
-            configue.load(self._get_path("test_file_1.yml"), "key1.subkey3.unknown_key")
+            self._load(self._get_path("test_file_1.yml"), "key1.subkey3.unknown_key")
 
     def test_load_invalid_import_raises_exception(self):
         with self.assertRaises(SubPathNotFound):
-            configue.load(self._get_path("test_file_2.yml"), "invalid_import")
+            self._load(self._get_path("test_file_2.yml"), "invalid_import")
 
     def test_load_external_value(self):
-        result = configue.load(self._get_path("test_file_2.yml"), "const")
+        result = self._load(self._get_path("test_file_2.yml"), "const")
         self.assertEqual(CONSTANT, result)
 
     def test_null_path(self):
-        result = configue.load(self._get_path("test_file_2.yml"), "paths")
+        result = self._load(self._get_path("test_file_2.yml"), "paths")
         self.assertIsNone(result["path"])
         self.assertEqual(os.path.expanduser("~"), result["path2"])
         self.assertIsNone(result["path3"])
 
     def test_logging_config(self):
-        configue.load(self._get_path("test_file_2.yml"), "const", logging_config_path="logging_config")
+        self._load(self._get_path("test_file_2.yml"), "const", logging_config_path="logging_config")
         logger = logging.getLogger("test.path")
         self.assertEqual(logging.DEBUG, logger.handlers[0].level)
         self.assertEqual(logging.ERROR, logger.handlers[1].level)
 
     def test_load_internal_value_from_other_file(self):
         os.environ["ENV_VAR"] = "test_file_1"
-        result = configue.load(self._get_path("test_file_2.yml"), "key1")
+        result = self._load(self._get_path("test_file_2.yml"), "key1")
         self.assertEqual("other_value", result["value5"])
         self.assertEqual("other_value", result["value6"])
 
     def test_ext_enum_loading(self):
-        result = configue.load(self._get_path("test_file_2.yml"), "enum_loading")
+        result = self._load(self._get_path("test_file_2.yml"), "enum_loading")
         self.assertEqual(Color.RED, result)
 
     def test_constructor_static_method_loading(self):
-        result = configue.load(self._get_path("test_file_2.yml"), "static_loading")
+        result = self._load(self._get_path("test_file_2.yml"), "static_loading")
         self.assertEqual("foo", result)
 
     def test_constructor_raises_exception_on_constructor_not_found(self):
         with self.assertRaises(NotFoundError):
-            configue.load(self._get_path("test_file_2.yml"), "invalid_loading")
+            self._load(self._get_path("test_file_2.yml"), "invalid_loading")
 
     def test_ext_raises_exception_on_module_not_found(self):
         with self.assertRaises(NotFoundError):
-            configue.load(self._get_path("test_file_2.yml"), "invalid_ext.wrong_module")
+            self._load(self._get_path("test_file_2.yml"), "invalid_ext.wrong_module")
 
     def test_ext_raises_exception_on_submodule_not_found(self):
         with self.assertRaises(NotFoundError):
-            configue.load(self._get_path("test_file_2.yml"), "invalid_ext.wrong_sub_module")
+            self._load(self._get_path("test_file_2.yml"), "invalid_ext.wrong_sub_module")
 
     def test_ext_raises_exception_on_element_not_found(self):
         with self.assertRaises(ConfigueError):
-            configue.load(self._get_path("test_file_2.yml"), "invalid_ext.wrong_element")
+            self._load(self._get_path("test_file_2.yml"), "invalid_ext.wrong_element")
 
     def test_ext_raises_exception_on_property_not_found(self):
         with self.assertRaises(KeyError):
-            configue.load(self._get_path("test_file_2.yml"), "invalid_ext.wrong_property")
+            self._load(self._get_path("test_file_2.yml"), "invalid_ext.wrong_property")
 
     def test_loading_empty_file(self):
-        content = configue.load(self._get_path("test_file_3.yml"))
+        content = self._load(self._get_path("test_file_3.yml"))
         self.assertIsNone(content)
 
+    def _load(self, file_path: str, sub_path: Union[str, List[str]] = "", **kwargs: Any) -> Any:
+        return configue.load(file_path, sub_path, **self.load_options, **kwargs)
+
     @staticmethod
     def _get_path(file_name: str) -> str:
         return os.path.join(os.path.dirname(__file__), file_name)
+
+
+class TestConfigueWithCache(TestConfigue):
+    load_options = {"use_cache": True}
+
+    def setUp(self) -> None:
+        configue.clear_cache()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        configue.clear_cache()
+
+
+class TestConfigueWithSeekSubPath(TestConfigue):
+    load_options = {"seek_sub_path": True}
+
+
+@skipUnless(yaml.__with_libyaml__, "PyYAML was built without libyaml")
+class TestConfigueWithCBackend(TestConfigue):
+    load_options = {"backend": "c"}
+
+    def test_c_backend_uses_libyaml_parser(self):
+        self.assertTrue(issubclass(get_parser_class("c"), CParser))
+
+    def test_load_with_seek_sub_path(self):
+        result = self._load(self._get_path("test_file_2.yml"), "key1.value4.other_key", seek_sub_path=True)
+        self.assertEqual("other_value", result)
+
+
+class TestConfigueWithPrefetchImports(TestConfigue):
+    load_options = {"prefetch_imports": True}
+
+    def test_load_composes_imported_files_in_threads(self):
+        thread_names_by_file = {}
+        compose = FileLoader._compose  # pylint: disable=protected-access
+
+        def compose_mock(file_loader: FileLoader) -> Any:
+            file_name = os.path.basename(file_loader._file_path)  # pylint: disable=protected-access
+            thread_names_by_file[file_name] = threading.current_thread().name
+            return compose(file_loader)
+
+        with patch.object(FileLoader, "_compose", compose_mock):
+            result = self._load(self._get_path("test_file_4.yml"), "modules.imported.key1.subkey1")
+        self.assertEqual("other_value", result["other_key"])
+        self.assertCountEqual(["test_file_1.yml", "test_file_4.yml"], thread_names_by_file.keys())
+        self.assertTrue(all(name.startswith("configue-prefetch") for name in thread_names_by_file.values()))
+
+    def test_load_with_missing_import_raises_same_exception(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "config.yml")
+            with open(file_path, "w", encoding="utf-8") as config_file:
+                config_file.write("valid: value\ninvalid: !import missing.yml\n")
+            self.assertEqual("value", self._load(file_path, "valid"))
+            with self.assertRaises(FileNotFoundError) as prefetch_context:
+                self._load(file_path, "invalid")
+            with self.assertRaises(FileNotFoundError) as serial_context:
+                configue.load(file_path, "invalid")
+        self.assertEqual(str(serial_context.exception), str(prefetch_context.exception))
+
+
+class TestBackends(TestCase):
+    def test_unknown_backend_raises_exception(self):
+        with self.assertRaises(UnknownBackendError):
+            configue.load(os.path.join(os.path.dirname(__file__), "test_file_1.yml"), backend="unknown")
+
+    def test_c_backend_falls_back_to_python_backend(self):
+        with patch.dict("configue.configue_loader.PARSER_CLASSES_BY_BACKEND", {"python": ConfigueLoader}, clear=True):
+            self.assertIs(ConfigueLoader, get_parser_class("c"))
+
+
+class TestPythonObjectCache(TestCase):
+    def setUp(self) -> None:
+        configue.clear_cache()
+
+    def tearDown(self) -> None:
+        configue.clear_cache()
+
+    def test_load_reuses_imported_python_objects(self):
+        file_path = os.path.join(os.path.dirname(__file__), "test_file_2.yml")
+        configue.load(file_path, "static_loading")
+        with patch.object(ConfigueLoader, "find_python_name") as find_python_name_mock:
+            self.assertEqual("foo", configue.load(file_path, "static_loading"))
+        find_python_name_mock.assert_not_called()
+
+    def test_clear_cache_empties_python_object_cache(self):
+        configue.load(os.path.join(os.path.dirname(__file__), "test_file_2.yml"), "static_loading")
+        self.assertIn("tests.external_module.Static.get_static_value", PYTHON_OBJECTS_BY_PATH)
+        configue.clear_cache()
+        self.assertEqual({}, PYTHON_OBJECTS_BY_PATH)
+
+
+class TestLoadAll(TempDirTestCase):
+    load_options: Dict[str, Any] = {}
+
+    def setUp(self) -> None:
+        super().setUp()
+        InstanceCounter.instance_count = 0
+        self._file_path = os.path.join(os.path.dirname(__file__), "test_file_5.yml")
+
+    def test_load_all_loads_each_document(self):
+        documents = list(configue.load_all(self._file_path, **self.load_options))
+        self.assertEqual(4, len(documents))
+        first_document, second_document, third_document, fourth_document = documents
+        self.assertEqual("first_module", first_document["module"].kwargs["name"])
+        self.assertEqual("second_module", second_document["module"].kwargs["name"])
+        self.assertIs(first_document["module"], first_document["shortcut"])
+        self.assertIs(first_document["module"], first_document["aliased"])
+        self.assertIs(second_document["module"], second_document["shortcut"])
+        self.assertIs(first_document["imported"], second_document["imported"])
+        self.assertIsNone(third_document)
+        self.assertEqual({"name": "fourth"}, fourth_document)
+
+    def test_load_all_with_env_vars(self):
+        with patch.dict(os.environ, {"ENV_VAR": "value"}):
+            documents = configue.load_all(self._file_path, "env", **self.load_options)
+            self.assertEqual(["value", "value"], [next(documents), next(documents)])
+
+    def test_load_all_loads_documents_lazily(self):
+        documents = configue.load_all(self._file_path, "module", **self.load_options)
+        self.assertEqual(0, InstanceCounter.instance_count)
+        self.assertEqual("first_module", next(documents).kwargs["name"])
+        self.assertEqual(1, InstanceCounter.instance_count)
+
+    def test_load_all_with_lazy(self):
+        document = next(configue.load_all(self._file_path, lazy=True, **self.load_options))
+        self.assertIsInstance(document, Mapping)
+        self.assertEqual(0, InstanceCounter.instance_count)
+        self.assertIs(document["module"], document["shortcut"])
+
+    def test_load_all_with_invalid_sub_path_raises_exception(self):
+        with self.assertRaises(SubPathNotFound):
+            list(configue.load_all(self._file_path, "unknown", **self.load_options))
+
+    def test_load_all_with_recursive_references(self):
+        file_path = self._write_file("documents.yml", "key: value\n---\nfirst: !cfg second\nsecond: !cfg first\n")
+        documents = configue.load_all(file_path, **self.load_options)
+        self.assertEqual({"key": "value"}, next(documents))
+        with self.assertRaises(ConfigueRecursionError):
+            next(documents)
+
+    def test_load_all_with_long_chain_of_references(self):
+        lines = [f"key_{index}: !cfg key_{index + 1}" for index in range(2000)] + ["key_2000: value"]
+        file_path = self._write_file("documents.yml", "key: value\n---\n" + "\n".join(lines))
+        documents = list(configue.load_all(file_path, **self.load_options))
+        self.assertEqual("value", documents[1]["key_0"])
+
+
+@skipUnless(yaml.__with_libyaml__, "PyYAML was built without libyaml")
+class TestLoadAllWithCBackend(TestLoadAll):
+    load_options = {"backend": "c"}
@@ -0,0 +1,77 @@
+import threading
+from typing import List
+from unittest import TestCase
+
+import yaml
+from yaml.constructor import ConstructorError
+
+from configue.construction_locks import ConstructionLocks
+
+
+class TestConstructionLocks(TestCase):
+    def setUp(self) -> None:
+        self._locks = ConstructionLocks()
+        self._first_node, self._second_node = yaml.compose("[first, second]").value
+
+    def test_lock_is_reentrant(self):
+        with self._locks.lock(self._first_node):
+            with self._locks.lock(self._first_node):
+                pass
+        self._assert_lock_is_free(self._first_node)
+
+    def test_lock_waits_for_other_thread(self):
+        events: List[str] = []
+        locked = threading.Event()
+
+        def construct() -> None:
+            with self._locks.lock(self._first_node):
+                locked.set()
+                threading.Event().wait(0.05)
+                events.append("constructed")
+
+        thread = threading.Thread(target=construct)
+        thread.start()
+        locked.wait()
+        with self._locks.lock(self._first_node):
+            events.append("reused")
+        thread.join()
+        self.assertEqual(["constructed", "reused"], events)
+
+    def test_lock_raises_exception_on_nodes_referencing_each_other(self):
+        errors: List[Exception] = []
+        barrier = threading.Barrier(2)
+
+        def construct(first_node: yaml.Node, second_node: yaml.Node) -> None:
+            try:
+                with self._locks.lock(first_node):
+                    barrier.wait()
+                    with self._locks.lock(second_node):
+                        pass
+            except ConstructorError as error:
+                errors.append(error)
+
+        threads = [
+            threading.Thread(target=construct, args=(self._first_node, self._second_node)),
+            threading.Thread(target=construct, args=(self._second_node, self._first_node)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(1, len(errors))
+        self.assertIn("recursive node", str(errors[0]))
+        self._assert_lock_is_free(self._first_node)
+        self._assert_lock_is_free(self._second_node)
+
+    def _assert_lock_is_free(self, node: yaml.Node) -> None:
+        acquired = threading.Event()
+
+        def acquire() -> None:
+            with self._locks.lock(node):
+                acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        thread.join(5)
+        self.assertTrue(acquired.is_set())
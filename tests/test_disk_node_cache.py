@@ -0,0 +1,106 @@
+import os
+import tempfile
+from typing import Any, Optional, cast
+from unittest.mock import patch
+
+import yaml
+from yaml import Node
+
+import configue
+from configue.disk_node_cache import DiskNodeCache
+from configue.exceptions import SubPathNotFound
+from tests.temp_dir_test_case import TempDirTestCase
+from tests.test_configue import TestConfigue
+
+
+class TestDiskNodeCache(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self._cache_dir = self._get_path("cache")
+        self._compose_count = 0
+
+    def test_get_node_restores_node_tree(self):
+        content = "key1: &anchor\n  - item1\n  - {subkey: 1.5}\nkey2: *anchor\nkey3: !cfg key1\nkey4: 'quoted'\nkey5:\n"
+        file_path = self._write_file("config.yml", content)
+        composed_node = self._get_node(file_path)
+        restored_node = self._get_node(file_path)
+        self.assertEqual(1, self._compose_count)
+        self.assertEqual(self._describe(composed_node), self._describe(restored_node))
+        self.assertIs(restored_node.value[0][1], restored_node.value[1][1])
+
+    def test_get_node_restores_recursive_node_tree(self):
+        file_path = self._write_file("config.yml", "key: &anchor [item, *anchor]\n")
+        self._get_node(file_path)
+        restored_node = self._get_node(file_path)
+        self.assertIs(restored_node.value[0][1], restored_node.value[0][1].value[1])
+
+    def test_get_node_restores_empty_file(self):
+        file_path = self._write_file("config.yml", "")
+        self.assertIsNone(self._get_node(file_path))
+        self.assertIsNone(self._get_node(file_path))
+        self.assertEqual(1, self._compose_count)
+
+    def test_get_node_composes_again_when_file_changes(self):
+        file_path = self._write_file("config.yml", "key: value")
+        self._get_node(file_path)
+        self._write_file("config.yml", "key: other_value")
+        self.assertEqual("other_value", self._get_node(file_path).value[0][1].value)
+        self.assertEqual(2, self._compose_count)
+
+    def test_get_node_composes_again_when_version_changes(self):
+        file_path = self._write_file("config.yml", "key: value")
+        self._get_node(file_path)
+        with patch("configue.disk_node_cache.SNAPSHOT_FORMAT_VERSION", -1):
+            self._get_node(file_path)
+        self.assertEqual(2, self._compose_count)
+
+    def test_get_node_composes_again_when_snapshot_is_invalid(self):
+        file_path = self._write_file("config.yml", "key: value")
+        self._get_node(file_path)
+        for snapshot_name in os.listdir(self._cache_dir):
+            with open(os.path.join(self._cache_dir, snapshot_name), "wb") as snapshot_file:
+                snapshot_file.write(b"invalid")
+        with self.assertLogs("configue.disk_node_cache", "WARNING"):
+            self.assertEqual("value", self._get_node(file_path).value[0][1].value)
+        self.assertEqual(2, self._compose_count)
+
+    def test_get_node_ignores_unwritable_cache_dir(self):
+        file_path = self._write_file("config.yml", "key: value")
+        cache = DiskNodeCache(file_path)
+        with self.assertLogs("configue.disk_node_cache", "WARNING"):
+            node: Any = cache.get_node(file_path, lambda: yaml.compose("key: value"))
+        self.assertEqual("value", node.value[0][1].value)
+
+    def test_load_with_cache_dir_keeps_error_marks(self):
+        file_path = self._write_file("config.yml", "key: value")
+        configue.load(file_path, cache_dir=self._cache_dir)
+        with self.assertRaisesRegex(SubPathNotFound, 'config.yml", line 1, column 1'):
+            configue.load(file_path, "unknown", cache_dir=self._cache_dir)
+
+    def _get_node(self, file_path: str) -> Any:
+        return DiskNodeCache(self._cache_dir).get_node(file_path, lambda: self._compose(file_path))
+
+    def _compose(self, file_path: str) -> Optional[Node]:
+        self._compose_count += 1
+        with open(file_path, encoding="utf-8") as file:
+            return cast(Optional[Node], yaml.compose(file))
+
+    def _describe(self, node: Any) -> Any:
+        if isinstance(node, tuple):
+            return tuple(self._describe(item) for item in node)
+        if isinstance(node.value, list):
+            return node.tag, [self._describe(item) for item in node.value]
+        return node.tag, node.value, node.style, node.start_mark.line, node.start_mark.column, node.end_mark.column
+
+
+class TestConfigueWithDiskNodeCache(TestConfigue):
+    _temp_dir: tempfile.TemporaryDirectory  # type: ignore[type-arg]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        cls.load_options = {"cache_dir": cls._temp_dir.name}
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._temp_dir.cleanup()
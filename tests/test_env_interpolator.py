@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from configue.env_interpolator import EnvInterpolator
+
+
+class TestEnvInterpolator(TestCase):
+    def test_interpolate_replaces_variables(self):
+        interpolator = EnvInterpolator({"VAR_1": "value1", "VAR_2": "value2"})
+        self.assertEqual("pre-value1-value2-post", interpolator.interpolate("pre-${VAR_1}-${VAR_2}-post"))
+
+    def test_interpolate_uses_default_values(self):
+        interpolator = EnvInterpolator({})
+        self.assertEqual("default", interpolator.interpolate("${VAR-default}"))
+        with self.assertLogs("configue.env_interpolator", "WARNING"):
+            self.assertEqual("", interpolator.interpolate("${VAR}"))
+
+    def test_interpolate_returns_none_without_variables(self):
+        interpolator = EnvInterpolator({"VAR": "value"})
+        self.assertIsNone(interpolator.interpolate("value"))
+        self.assertIsNone(interpolator.interpolate("${}"))
+
+    def test_record_variables(self):
+        interpolator = EnvInterpolator({"VAR_1": "value1"})
+        self.assertFalse(interpolator.is_recording())
+        with interpolator.record_variables() as variable_names:
+            interpolator.interpolate("${VAR_1}")
+            with interpolator.record_variables() as nested_variable_names:
+                self.assertTrue(interpolator.is_recording())
+                interpolator.interpolate("${VAR_2-default}")
+            self.assertEqual({"VAR_2"}, nested_variable_names)
+        self.assertEqual({"VAR_1", "VAR_2"}, variable_names)
+        self.assertFalse(interpolator.is_recording())
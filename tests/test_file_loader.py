@@ -0,0 +1,50 @@
+import os
+
+from configue.file_loader import FileLoader
+from configue.root_loader import RootLoader
+from tests.temp_dir_test_case import TempDirTestCase
+
+
+class TestFileLoader(TempDirTestCase):
+
+    def test_load_in_wide_mapping(self):
+        content = "".join(f"key{index}:\n  value: {index}\n" for index in range(1000))
+        file_loader = self._get_file_loader(content)
+        self.assertEqual(999, file_loader.load("key999.value"))
+        self.assertEqual(0, file_loader.load(["key0", "value"]))
+
+    def test_load_duplicated_key_returns_first_value(self):
+        file_loader = self._get_file_loader("key: 1\nkey: 2\n")
+        self.assertEqual(1, file_loader.load("key"))
+
+    def test_load_same_path_returns_same_instance(self):
+        file_loader = self._get_file_loader("key:\n  subkey: [item]\nother_key: !cfg key.subkey\n")
+        self.assertIs(file_loader.load("key.subkey"), file_loader.load("other_key"))
+        self.assertIs(file_loader.load("key.subkey"), file_loader.load("key.subkey"))
+
+    def test_load_uses_environment_from_root_loader_creation(self):
+        file_loader = self._get_file_loader("key: ${CONFIGUE_TEST_VAR-default}\n")
+        os.environ["CONFIGUE_TEST_VAR"] = "value"
+        try:
+            self.assertEqual("default", file_loader.load("key"))
+        finally:
+            os.environ.pop("CONFIGUE_TEST_VAR")
+
+    def test_get_import_paths(self):
+        os.environ["CONFIGUE_TEST_VAR"] = "env"
+        try:
+            file_loader = self._get_file_loader(
+                "first: !import first.yml\nsecond: !import:key ${CONFIGUE_TEST_VAR}.yml\n"
+                "third: !import ${CONFIGUE_MISSING_VAR-null}\n"
+            )
+        finally:
+            os.environ.pop("CONFIGUE_TEST_VAR")
+        self.assertEqual(
+            [self._get_path("first.yml"), self._get_path("env.yml")],
+            file_loader.get_import_paths(),
+        )
+        self.assertEqual([self._get_path("first.yml")], file_loader.get_static_import_paths())
+
+    def _get_file_loader(self, content: str) -> FileLoader:
+        file_path = self._write_file("config.yml", content)
+        return FileLoader(file_path, RootLoader(file_path))
@@ -0,0 +1,142 @@
+import copy
+import gc
+import pickle
+import sys
+import weakref
+from unittest import TestCase
+
+import configue
+from configue.frozen import FrozenMapping, FrozenSequence, Freezer
+from tests.external_module import InstanceCounter
+from tests.temp_dir_test_case import TempDirTestCase
+
+CONFIG_CONTENT = """first:
+  settings:
+    host: localhost
+    ports: [80, 443]
+    enabled: true
+  counter:
+    (): tests.external_module.InstanceCounter
+    name: first
+second:
+  settings:
+    host: localhost
+    ports: [80, 443]
+    enabled: true
+  counter: !cfg first.counter
+integers:
+  settings:
+    host: localhost
+    ports: [80, 443]
+    enabled: 1
+shortcut: !cfg first.settings
+"""
+
+
+class TestFreezer(TestCase):
+    def test_freeze(self):
+        frozen_value = Freezer().freeze({"key": [1, {"nested": "value"}], "other": None})
+        self.assertIsInstance(frozen_value, FrozenMapping)
+        self.assertIsInstance(frozen_value["key"], FrozenSequence)
+        self.assertIsInstance(frozen_value["key"][1], FrozenMapping)
+        self.assertEqual({"key": [1, {"nested": "value"}], "other": None}, frozen_value)
+        self.assertEqual("value", frozen_value.key[1].nested)
+        self.assertEqual(["key", "other"], list(frozen_value))
+        self.assertEqual(FrozenSequence((1,)), frozen_value["key"][:1])
+
+    def test_frozen_values_are_read_only(self):
+        frozen_value = Freezer().freeze({"key": [1]})
+        with self.assertRaises(TypeError):
+            frozen_value["key"] = 2
+        with self.assertRaises(TypeError):
+            frozen_value["key"][0] = 2
+        with self.assertRaises(AttributeError):
+            frozen_value.key = 2
+        with self.assertRaises(AttributeError):
+            _ = frozen_value.missing
+
+    def test_freeze_shares_identical_subtrees(self):
+        freezer = Freezer()
+        first = freezer.freeze({"a": {"b": [1, 2]}, "c": {"b": [1, 2]}})
+        second = freezer.freeze({"b": [1, 2]})
+        self.assertIs(first["a"], first["c"])
+        self.assertIs(first["a"], second)
+        # The mappings with the same keys share their index
+        other = freezer.freeze({"b": "other"})
+        self.assertIs(second._indexes_by_key, other._indexes_by_key)  # pylint: disable=protected-access
+
+    def test_freeze_does_not_merge_values_of_different_types(self):
+        freezer = Freezer()
+        frozen_value = freezer.freeze([{"a": 1}, {"a": True}, {"a": 1.0}])
+        self.assertEqual([int, bool, float], [type(item["a"]) for item in frozen_value])
+
+    def test_freeze_keeps_objects(self):
+        instances = [object(), object()]
+        frozen_value = Freezer().freeze([{"object": instances[0]}, {"object": instances[1]}])
+        self.assertIs(instances[0], frozen_value[0]["object"])
+        self.assertIs(instances[1], frozen_value[1]["object"])
+
+    def test_freeze_interns_strings(self):
+        key = "".join(["frozen", "_key"])
+        frozen_value = Freezer().freeze({key: ["".join(["frozen", "_value"]), "".join(["frozen", "_value"])]})
+        self.assertIs(sys.intern("frozen_key"), next(iter(frozen_value)))
+        self.assertIs(frozen_value[key][0], frozen_value[key][1])
+
+    def test_hash_and_equality(self):
+        first = Freezer().freeze({"a": [1, 2], "b": "c"})
+        second = Freezer().freeze({"b": "c", "a": [1, 2]})
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual({first: "value"}[second], "value")
+        self.assertNotEqual(first, Freezer().freeze({"a": [1, 2], "b": "d"}))
+        self.assertEqual(hash((1, 2)), hash(first["a"]))
+
+    def test_copy_and_pickle(self):
+        frozen_value = Freezer().freeze({"a": [1, {"b": "c"}]})
+        self.assertEqual(frozen_value, copy.deepcopy(frozen_value))
+        self.assertEqual(frozen_value, pickle.loads(pickle.dumps(frozen_value)))
+
+
+class TestLoadFrozen(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        InstanceCounter.instance_count = 0
+        self._file_path = self._write_file("config.yml", CONFIG_CONTENT)
+
+    def test_load_with_frozen(self):
+        config = configue.load(self._file_path, frozen=True)
+        self.assertIsInstance(config, FrozenMapping)
+        self.assertEqual(configue.load(self._file_path, "integers"), config.integers)
+        self.assertIs(config.first.settings, config.second.settings)
+        self.assertIs(config.first.settings, config.shortcut)
+        self.assertIsNot(config.first.settings, config.integers.settings)
+        self.assertIs(config.first.settings.ports, config.integers.settings.ports)
+        self.assertIs(config.first.counter, config.second.counter)
+        self.assertIsInstance(config.first.counter, InstanceCounter)
+
+    def test_get_with_frozen_shares_subtrees_between_sub_paths(self):
+        config = configue.Config(self._file_path)
+        self.assertIs(config.get("first.settings", frozen=True), config.get("second.settings", frozen=True))
+        self.assertIsInstance(config.get("first.settings"), dict)
+
+    def test_load_many_and_load_all_with_frozen(self):
+        first, second = configue.load_many(self._file_path, ["first.settings", "second.settings"], frozen=True)
+        self.assertIs(first, second)
+        documents = list(configue.load_all(self._file_path, "first.settings", frozen=True))
+        self.assertEqual([first], documents)
+        self.assertIsInstance(documents[0], FrozenMapping)
+
+    def test_load_all_with_frozen_releases_previous_documents(self):
+        file_path = self._write_file(
+            "documents.yml", "counter: {(): tests.external_module.InstanceCounter}\n---\ncounter: {}\n"
+        )
+        documents = configue.load_all(file_path, frozen=True)
+        counter = weakref.ref(next(documents).counter)
+        next(documents)
+        gc.collect()
+        self.assertIsNone(counter())
+
+    def test_load_with_frozen_and_lazy(self):
+        config = configue.load(self._file_path, lazy=True, frozen=True)
+        self.assertNotIsInstance(config, FrozenMapping)
+        self.assertEqual("localhost", config["first"]["settings"]["host"])
@@ -0,0 +1,74 @@
+import os
+from unittest import TestCase
+
+import configue
+from configue.lazy import LazyMapping, LazySequence
+from tests.external_module import InstanceCounter
+from tests.temp_dir_test_case import TempDirTestCase
+
+
+class TestLazy(TestCase):
+    def setUp(self) -> None:
+        InstanceCounter.instance_count = 0
+
+    def test_load_lazy_constructs_objects_on_access(self):
+        result = configue.load(self._get_path("test_file_4.yml"), "modules", lazy=True)
+        self.assertIsInstance(result, LazyMapping)
+        self.assertEqual(0, InstanceCounter.instance_count)
+        self.assertEqual({"name": "enabled"}, result["enabled"].kwargs)
+        self.assertEqual(1, InstanceCounter.instance_count)
+
+    def test_load_lazy_shares_object_instances(self):
+        result = configue.load(self._get_path("test_file_4.yml"), "modules", lazy=True)
+        self.assertIs(result["enabled"], result["shortcut"])
+        self.assertIs(result["enabled"], result["items"][1])
+        self.assertIs(result["items"], result["items"])
+        self.assertEqual(1, InstanceCounter.instance_count)
+
+    def test_load_lazy_imports_files_on_access(self):
+        result = configue.load(self._get_path("test_file_4.yml"), "modules.imported", lazy=True)
+        self.assertIsInstance(result, LazyMapping)
+        self.assertEqual({"other_key": "other_value"}, result["key1"]["subkey1"])
+        self.assertIs(result["key1"]["subkey1"], result["key1"]["subkey4"]["subkey5"])
+
+    def test_load_lazy_sub_path_in_imported_file(self):
+        result = configue.load(self._get_path("test_file_4.yml"), "modules.imported.key1.subkey3", lazy=True)
+        self.assertIsInstance(result, LazySequence)
+        self.assertEqual(["item1", "item2"], result)
+
+    def test_lazy_sequence(self):
+        result = configue.load(self._get_path("test_file_4.yml"), "modules.items", lazy=True)
+        self.assertEqual(3, len(result))
+        self.assertEqual("item", result[0])
+        self.assertEqual(["nested_item"], result[-1])
+        self.assertEqual(["item"], result[:1])
+        self.assertNotEqual("item", result)
+
+    def test_lazy_mapping(self):
+        result = configue.load(self._get_path("test_file_4.yml"), "modules", lazy=True)
+        self.assertEqual(["enabled", "disabled", "imported", "shortcut", "items", "()"], list(result))
+        self.assertIn("()", result)
+        self.assertEqual("escaped", result["()"])
+        with self.assertRaises(KeyError):
+            result["unknown"]  # pylint: disable=pointless-statement
+        with self.assertRaises(TypeError):
+            result["enabled"] = None
+
+    def test_lazy_result_equals_eager_result(self):
+        lazy_result = configue.load(self._get_path("test_file_1.yml"), "env", lazy=True)
+        self.assertEqual(configue.load(self._get_path("test_file_1.yml"), "env"), lazy_result)
+
+    @staticmethod
+    def _get_path(file_name: str) -> str:
+        return os.path.join(os.path.dirname(__file__), file_name)
+
+
+class TestLazyRecursiveAnchors(TempDirTestCase):
+    def test_repr_with_recursive_anchors(self):
+        file_path = self._write_file(
+            "config.yml", "sequence: &sequence [1, *sequence]\nmapping: &mapping {self: *mapping}\n"
+        )
+        result = configue.load(file_path, lazy=True)
+        self.assertIs(result["sequence"], result["sequence"][1])
+        self.assertEqual("LazySequence([1, ...])", repr(result["sequence"]))
+        self.assertEqual("LazyMapping({'self': ...})", repr(result["mapping"]))
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import json
+import os
+from typing import List, Tuple
+from unittest.mock import Mock, patch
+
+from configue.__main__ import main
+from configue.disk_node_cache import DiskNodeCache
+from tests.temp_dir_test_case import TempDirTestCase
+
+
+class TestMain(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self._file_path = self._write_file(
+            "config.yml", "key: !import imported.yml\nother: !import ${CONFIGUE_CLI_VAR}.yml\n"
+        )
+        self._write_file("imported.yml", "value: 1\nnested: !import nested/nested.yml\n")
+        os.mkdir(self._get_path("nested"))
+        self._write_file(os.path.join("nested", "nested.yml"), "object:\n  (): tests.external_module.InstanceCounter\n")
+        self._write_file("env.yml", "- ${CONFIGUE_CLI_VAR}\n")
+
+    def test_resolve(self):
+        with patch.dict(os.environ, {"CONFIGUE_CLI_VAR": "env"}):
+            exit_code, output, _ = self._run(["resolve", self._file_path, "key", "--indent", "0"])
+        self.assertEqual(0, exit_code)
+        resolved_value = json.loads(output)
+        self.assertEqual(1, resolved_value["value"])
+        self.assertTrue(resolved_value["nested"]["object"].startswith("<tests.external_module.InstanceCounter"))
+
+    def test_precompile(self):
+        cache_dir = self._get_path("cache")
+        exit_code, output, _ = self._run(["precompile", self._temp_dir.name, "--cache-dir", cache_dir])
+        self.assertEqual(0, exit_code)
+        self.assertEqual(4, len(output.splitlines()))
+        # The snapshots are used instead of composing the files
+        self.assertIsNotNone(DiskNodeCache(cache_dir).get_node(self._file_path, Mock(side_effect=AssertionError)))
+
+    def test_precompile_with_invalid_file(self):
+        self._write_file("invalid.yml", "key: [\n")
+        cache_dir = self._get_path("cache")
+        exit_code, output, errors = self._run(["precompile", self._temp_dir.name, "--cache-dir", cache_dir])
+        self.assertEqual(1, exit_code)
+        self.assertEqual(4, len(output.splitlines()))
+        self.assertIn("invalid.yml", errors)
+
+    def test_imports(self):
+        with patch.dict(os.environ, {"CONFIGUE_CLI_VAR": "env"}):
+            exit_code, output, _ = self._run(["imports", self._file_path])
+        self.assertEqual(0, exit_code)
+        self.assertEqual(
+            [
+                self._get_path(file_name)
+                for file_name in ["env.yml", "imported.yml", os.path.join("nested", "nested.yml")]
+            ],
+            output.splitlines(),
+        )
+
+    def test_imports_with_missing_file(self):
+        with patch.dict(os.environ, {"CONFIGUE_CLI_VAR": "missing"}):
+            exit_code, output, errors = self._run(["imports", self._file_path])
+        self.assertEqual(1, exit_code)
+        self.assertIn("missing.yml", output)
+        self.assertIn("Could not find", errors)
+
+    def test_timings(self):
+        with patch.dict(os.environ, {"CONFIGUE_CLI_VAR": "env"}):
+            exit_code, output, _ = self._run(["timings", self._file_path, "--max-lines", "1"])
+        self.assertEqual(0, exit_code)
+        self.assertEqual(
+            ["load", "parse", "import", "constructor", "interpolation"],
+            [line.split(":")[0] for line in output.splitlines() if not line.startswith(" ")],
+        )
+
+    def test_unknown_command(self):
+        with self.assertRaises(SystemExit), patch("sys.stderr"):
+            main(["unknown"])
+
+    @staticmethod
+    def _run(arguments: List[str]) -> Tuple[int, str, str]:
+        output = io.StringIO()
+        errors = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+            exit_code = main(arguments)
+        return exit_code, output.getvalue(), errors.getvalue()
@@ -0,0 +1,74 @@
+import os
+
+
+from yaml import ScalarNode
+
+import configue
+from configue.node_cache import DEFAULT_NODE_CACHE, NodeCache
+from tests.temp_dir_test_case import TempDirTestCase
+
+
+class TestNodeCache(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self._compose_count = 0
+
+    def tearDown(self) -> None:
+        configue.clear_cache()
+
+    def test_get_node_composes_file_once(self):
+        file_path = self._write_file("config.yml", "key: value")
+        cache = NodeCache()
+        first_node = cache.get_node(file_path, self._compose)
+        second_node = cache.get_node(file_path, self._compose)
+        self.assertIs(first_node, second_node)
+        self.assertEqual(1, self._compose_count)
+
+    def test_get_node_uses_real_path(self):
+        file_path = self._write_file("config.yml", "key: value")
+        link_path = self._get_path("link.yml")
+        os.symlink(file_path, link_path)
+        cache = NodeCache()
+        cache.get_node(file_path, self._compose)
+        cache.get_node(link_path, self._compose)
+        self.assertEqual(1, self._compose_count)
+
+    def test_get_node_composes_again_when_file_changes(self):
+        file_path = self._write_file("config.yml", "key: value")
+        cache = NodeCache()
+        cache.get_node(file_path, self._compose)
+        self._write_file("config.yml", "key: other_value")
+        cache.get_node(file_path, self._compose)
+        self.assertEqual(2, self._compose_count)
+
+    def test_get_node_evicts_least_recently_used_entries(self):
+        first_path = self._write_file("first.yml", "key: value")
+        second_path = self._write_file("second.yml", "key: value")
+        cache = NodeCache(max_size=1)
+        cache.get_node(first_path, self._compose)
+        cache.get_node(second_path, self._compose)
+        self.assertEqual(1, len(cache))
+        cache.get_node(first_path, self._compose)
+        self.assertEqual(3, self._compose_count)
+
+    def test_load_with_cache_reloads_modified_file(self):
+        file_path = self._write_file("config.yml", "key: value")
+        self.assertEqual("value", configue.load(file_path, "key", use_cache=True))
+        self._write_file("config.yml", "key: other_value")
+        self.assertEqual("other_value", configue.load(file_path, "key", use_cache=True))
+
+    def test_clear_cache_empties_default_cache(self):
+        file_path = self._write_file("config.yml", "key: value")
+        configue.load(file_path, use_cache=True)
+        self.assertEqual(1, len(DEFAULT_NODE_CACHE))
+        configue.clear_cache()
+        self.assertEqual(0, len(DEFAULT_NODE_CACHE))
+
+    def test_load_without_cache_does_not_fill_cache(self):
+        file_path = self._write_file("config.yml", "key: value")
+        configue.load(file_path)
+        self.assertEqual(0, len(DEFAULT_NODE_CACHE))
+
+    def _compose(self) -> ScalarNode:
+        self._compose_count += 1
+        return ScalarNode("tag:yaml.org,2002:str", "value")
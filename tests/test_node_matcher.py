@@ -0,0 +1,61 @@
+from typing import Dict, Optional, Tuple
+from unittest import TestCase
+
+import yaml
+from yaml import Node, ScalarNode
+
+from configue.node_matcher import UnchangedNodeMatcher
+
+
+class TestUnchangedNodeMatcher(TestCase):
+    def test_match_identical_documents(self):
+        matched_nodes = self._match("key: [value, {sub_key: 1}]", "key: [value, {sub_key: 1}]")
+        self.assertEqual(7, len(matched_nodes))
+
+    def test_match_values_by_key(self):
+        previous_node, node = yaml.compose("first: 1\nsecond: [2]"), yaml.compose("second: [2]\nfirst: 1\nthird: 3")
+        matched_nodes = UnchangedNodeMatcher(previous_node, node, lambda _: True, self._get_cfg_target).match()
+        self.assertNotIn(node, matched_nodes)
+        self.assertIs(previous_node.value[0][1], matched_nodes[node.value[1][1]])
+        self.assertIs(previous_node.value[1][1], matched_nodes[node.value[0][1]])
+        self.assertNotIn(node.value[2][1], matched_nodes)
+
+    def test_match_changed_scalar_style(self):
+        self.assertEqual({}, self._match("'1'", "1"))
+
+    def test_match_changed_import(self):
+        previous_node, node = yaml.compose("key: !import file.yml"), yaml.compose("key: !import file.yml")
+        matched_nodes = UnchangedNodeMatcher(previous_node, node, lambda _: False, self._get_cfg_target).match()
+        self.assertEqual({node.value[0][0]: previous_node.value[0][0]}, matched_nodes)
+
+    def test_match_cfg_with_changed_target(self):
+        matched_nodes = self._match("key: 1\nshortcut: !cfg key", "key: 2\nshortcut: !cfg key")
+        self.assertEqual({"key", "shortcut"}, {node.value for node in matched_nodes})
+
+    def test_match_cfg_with_unchanged_target(self):
+        matched_nodes = self._match("key: 1\nshortcut: !cfg key", "key: 1\nother: 2\nshortcut: !cfg key")
+        self.assertEqual(["key", "1", "shortcut", "key"], [node.value for node in matched_nodes])
+
+    def test_match_alias_of_different_nodes(self):
+        previous_node, node = yaml.compose("first: [1]\nsecond: [1]"), yaml.compose(
+            "first: &anchor [1]\nsecond: *anchor"
+        )
+        matched_nodes = UnchangedNodeMatcher(previous_node, node, lambda _: True, self._get_cfg_target).match()
+        self.assertNotIn(node, matched_nodes)
+        self.assertIs(previous_node.value[0][1], matched_nodes[node.value[0][1]])
+
+    def test_match_recursive_nodes(self):
+        matched_nodes = self._match("&anchor [*anchor]", "&anchor [*anchor]")
+        self.assertEqual({}, matched_nodes)
+
+    def _match(self, previous_content: str, content: str) -> Dict[Node, Node]:
+        return UnchangedNodeMatcher(
+            yaml.compose(previous_content), yaml.compose(content), lambda _: True, self._get_cfg_target
+        ).match()
+
+    @staticmethod
+    def _get_cfg_target(root_node: Node, node: ScalarNode) -> Optional[Tuple[Node, int]]:
+        for key_node, value_node in root_node.value:
+            if key_node.value == node.value:
+                return value_node, 1
+        return None
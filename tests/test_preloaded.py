@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+from unittest.mock import patch
+
+import configue
+from configue.exceptions import SubPathNotFound
+from configue.preloaded import PreloadedMapping, PreloadedSequence
+from tests.external_module import InstanceCounter
+from tests.temp_dir_test_case import TempDirTestCase
+
+CONFIG_CONTENT = """settings:
+  name: service
+  workers: 4
+  ratio: 0.5
+  debug: false
+  missing: ~
+  env: ${PRELOADED_ENV_VAR}
+  env_list: ${PRELOADED_ENV_LIST}
+  hosts: [first, second]
+  1: integer key
+  \\(): escaped
+counter:
+  (): tests.external_module.InstanceCounter
+  settings: !cfg settings
+shortcut: !cfg settings.hosts
+counter_shortcut: !cfg counter
+imported: !import imported.yml
+imported_value: !import:key imported.yml
+date: 2024-01-01
+ext: !ext tests.external_module.CONSTANT
+"""
+
+
+class TestPreloadedConfig(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        InstanceCounter.instance_count = 0
+        self._file_path = self._write_file("config.yml", CONFIG_CONTENT)
+        self._write_file("imported.yml", "key: value\nlist: [1, 2]\n")
+        env_patch = patch.dict(os.environ, {"PRELOADED_ENV_VAR": "12", "PRELOADED_ENV_LIST": "[a, b]"})
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+
+    def test_get_objects_under_non_string_keys(self):
+        content = (
+            "objects:\n  on: {(): tests.external_module.InstanceCounter, name: bool}\n"
+            "  0x10: {(): tests.external_module.InstanceCounter, name: int}\n"
+            "shortcut: !cfg objects\n"
+        )
+        file_path = self._write_file("keys.yml", content)
+        objects = configue.PreloadedConfig(file_path).get("shortcut")
+        self.assertEqual("bool", objects[True].kwargs["name"])
+        self.assertEqual("int", objects[16].kwargs["name"])
+
+    def test_get_plain_data(self):
+        preloaded_config = configue.PreloadedConfig(self._file_path)
+        settings = preloaded_config.get("settings")
+        self.assertIsInstance(settings, PreloadedMapping)
+        self.assertEqual(configue.load(self._file_path, "settings"), settings)
+        self.assertEqual("()", list(settings)[-1])
+        self.assertIsInstance(settings["hosts"], PreloadedSequence)
+        self.assertEqual(12, preloaded_config.get("settings.env"))
+        self.assertEqual("second", preloaded_config.get("settings.hosts.1"))
+        self.assertEqual({"key": "value", "list": [1, 2]}, preloaded_config.get("imported"))
+        self.assertEqual("value", preloaded_config.get("imported_value"))
+        self.assertEqual("constant", preloaded_config.get("ext"))
+        self.assertEqual(2024, preloaded_config.get("date").year)
+
+    def test_get_integer_key(self):
+        preloaded_config = configue.PreloadedConfig(self._file_path)
+        self.assertEqual(configue.load(self._file_path, "settings.1"), preloaded_config.get("settings.1"))
+        self.assertEqual("integer key", preloaded_config.get(["settings", "1"]))
+
+    def test_get_missing_sub_path_raises_exception(self):
+        preloaded_config = configue.PreloadedConfig(self._file_path)
+        for sub_path in [
+            "unknown",
+            "settings.unknown",
+            "settings.hosts.2",
+            "settings.hosts.unknown",
+            "counter.unknown",
+        ]:
+            with self.subTest(sub_path=sub_path), self.assertRaises(SubPathNotFound):
+                preloaded_config.get(sub_path)
+
+    def test_repr_with_recursive_anchors(self):
+        file_path = self._write_file(
+            "recursive.yml", "sequence: &sequence [1, *sequence]\nmapping: &mapping {self: *mapping}\n"
+        )
+        preloaded_config = configue.PreloadedConfig(file_path)
+        self.assertEqual("PreloadedSequence([1, LazySequence([1, ...])])", repr(preloaded_config.get("sequence")))
+        self.assertEqual(
+            "PreloadedMapping({'self': LazyMapping({'self': ...})})", repr(preloaded_config.get("mapping"))
+        )
+
+    def test_get_shares_values(self):
+        preloaded_config = configue.PreloadedConfig(self._file_path)
+        self.assertIs(preloaded_config.get("settings.hosts"), preloaded_config.get("shortcut"))
+        self.assertIs(preloaded_config.get("counter"), preloaded_config.get("counter_shortcut"))
+        self.assertEqual(1, InstanceCounter.instance_count)
+
+    def test_objects_are_instantiated_on_access(self):
+        preloaded_config = configue.PreloadedConfig(self._file_path)
+        self.assertEqual(0, InstanceCounter.instance_count)
+        counter = preloaded_config.get("counter")
+        self.assertIsInstance(counter, InstanceCounter)
+        self.assertEqual(1, InstanceCounter.instance_count)
+        self.assertEqual("service", counter.kwargs["settings"]["name"])
+        self.assertEqual(1, preloaded_config.get("counter.instance_count"))
+
+    def test_get_with_sub_path(self):
+        preloaded_config = configue.PreloadedConfig(self._file_path, "settings.hosts")
+        self.assertEqual(["first", "second"], preloaded_config.get())
+        self.assertEqual("first", preloaded_config.get("0"))
+        self.assertEqual("service", configue.PreloadedConfig(self._file_path, ["settings", "name"]).get())
+
+    def test_get_from_forked_process(self):
+        if "fork" not in multiprocessing.get_all_start_methods():
+            self.skipTest("fork is not available")
+        preloaded_config = configue.PreloadedConfig(self._file_path)
+        self.assertGreater(preloaded_config.nbytes, 0)
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+
+        def load_in_worker():
+            counter = preloaded_config.get("counter")
+            queue.put(
+                (
+                    preloaded_config.get("settings.hosts.0"),
+                    InstanceCounter.instance_count,
+                    counter.kwargs["settings"]["workers"],
+                )
+            )
+
+        process = context.Process(target=load_in_worker)
+        process.start()
+        result = queue.get(timeout=10)
+        process.join()
+        self.assertEqual(("first", 1, 4), result)
+        self.assertEqual(0, InstanceCounter.instance_count)
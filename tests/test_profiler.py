@@ -0,0 +1,53 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+import configue
+from configue.profiler import CONSTRUCTOR_PHASE, IMPORT_PHASE, INTERPOLATION_PHASE, LOAD_PHASE, PARSE_PHASE
+
+
+class TestLoadProfiler(TestCase):
+    def setUp(self) -> None:
+        self._profiler = configue.LoadProfiler()
+
+    def test_load_records_phases(self):
+        file_path = self._get_path("test_file_4.yml")
+        configue.load(file_path, "modules", profiler=self._profiler)
+        self.assertEqual(["modules"], list(self._profiler.get_stats(LOAD_PHASE)))
+        self.assertCountEqual(
+            [file_path, self._get_path("test_file_1.yml")], self._profiler.get_stats(PARSE_PHASE).keys()
+        )
+        self.assertEqual([self._get_path("test_file_1.yml")], list(self._profiler.get_stats(IMPORT_PHASE)))
+        constructor_stats = self._profiler.get_stats(CONSTRUCTOR_PHASE)
+        self.assertEqual(2, constructor_stats["tests.external_module.InstanceCounter"].call_count)
+        self.assertEqual(1, constructor_stats["tests.external_module.MyObject"].call_count)
+        self.assertEqual(3, self._profiler.get_total(CONSTRUCTOR_PHASE).call_count)
+        self.assertTrue(all(stats.duration > 0 for stats in constructor_stats.values()))
+
+    def test_load_records_interpolations(self):
+        file_path = self._get_path("test_file_1.yml")
+        with patch.dict(os.environ, {"ENV_VAR": "value"}):
+            configue.load(file_path, "env", profiler=self._profiler)
+        self.assertEqual(10, self._profiler.get_stats(INTERPOLATION_PHASE)[file_path].call_count)
+
+    def test_load_records_imported_sub_paths(self):
+        configue.load(self._get_path("test_file_2.yml"), "key1.value4", profiler=self._profiler)
+        self.assertIn(f"{self._get_path('test_file_1.yml')}:key1.subkey1", self._profiler.get_stats(IMPORT_PHASE))
+
+    def test_config_get_records_loads(self):
+        config = configue.Config(self._get_path("test_file_4.yml"), profiler=self._profiler)
+        config.get("modules.enabled")
+        config.get(["modules", "enabled"])
+        self.assertEqual(2, self._profiler.get_stats(LOAD_PHASE)["modules.enabled"].call_count)
+
+    def test_log_report(self):
+        configue.load(self._get_path("test_file_4.yml"), profiler=self._profiler)
+        with self.assertLogs("configue.profiler", "INFO") as logs:
+            self._profiler.log_report(max_lines_per_phase=1)
+        report_lines = logs.records[0].getMessage().splitlines()
+        self.assertEqual(11, len(report_lines))
+        self.assertTrue(report_lines[7].startswith("constructor: 3 in "))
+
+    @staticmethod
+    def _get_path(file_name: str) -> str:
+        return os.path.join(os.path.dirname(__file__), file_name)
@@ -0,0 +1,127 @@
+from typing import Dict, Tuple
+
+from yaml import Node
+
+import configue
+from configue.exceptions import ConfigueRecursionError
+from configue.file_loader import FileLoader
+from configue.reference_graph import ReferenceGraph
+from configue.root_loader import RootLoader
+from tests.temp_dir_test_case import TempDirTestCase
+
+
+class TestReferenceGraph(TempDirTestCase):
+    def test_get_construction_order(self):
+        file_path = self._write_files(
+            {
+                "config.yml": "first: !cfg second\nsecond: !import imported.yml\nthird: !cfg second.key\n",
+                "imported.yml": "key: !cfg other\nother: value\n",
+            }
+        )
+        root_loader = RootLoader(file_path)
+        reference_graph = ReferenceGraph()
+        construction_order = reference_graph.get_construction_order(*self._get_node(root_loader, file_path, ""))
+        self.assertEqual(
+            ["other", "imported.yml", "second", "second.key"], [node.value for _, node in construction_order]
+        )
+        # The references are only returned once
+        self.assertEqual([], reference_graph.get_construction_order(*self._get_node(root_loader, file_path, "first")))
+
+    def test_load_with_recursive_cfg(self):
+        file_path = self._write_files({"config.yml": "first: !cfg second\nsecond:\n  key: !cfg first\n"})
+        with self.assertRaises(ConfigueRecursionError) as context:
+            configue.load(file_path)
+        self.assertEqual(
+            f'Found recursive references: !cfg second in "{file_path}", line 1, column 8 -> '
+            f'!cfg first in "{file_path}", line 3, column 8 -> !cfg second in "{file_path}", line 1, column 8',
+            str(context.exception),
+        )
+
+    def test_load_with_cfg_referencing_parent(self):
+        file_path = self._write_files({"config.yml": "first:\n  key: !cfg first\n"})
+        with self.assertRaises(ConfigueRecursionError):
+            configue.load(file_path, "first")
+
+    def test_load_with_recursive_path(self):
+        file_path = self._write_files({"config.yml": "first: !cfg second.key\nsecond: !cfg first.key\n"})
+        with self.assertRaises(ConfigueRecursionError):
+            configue.load(file_path)
+
+    def test_load_with_recursive_imports(self):
+        file_path = self._write_files(
+            {"config.yml": "key: !import imported.yml\n", "imported.yml": "key: !import:key config.yml\n"}
+        )
+        with self.assertRaises(ConfigueRecursionError) as context:
+            configue.load(file_path)
+        self.assertIn("!import imported.yml", str(context.exception))
+        self.assertIn("!import:key config.yml", str(context.exception))
+
+    def test_load_lazy_with_recursive_cfg(self):
+        file_path = self._write_files({"config.yml": "first: !cfg second\nsecond: !cfg first\n"})
+        with self.assertRaises(ConfigueRecursionError):
+            configue.load(file_path, "first", lazy=True)
+        # The references contained in mappings are only constructed on access
+        file_path = self._write_files({"config.yml": "first: !cfg second\nsecond:\n  key: !cfg first\n"})
+        self.assertEqual(["key"], list(configue.load(file_path, "first", lazy=True)["key"]))
+
+    def test_load_lazy_with_recursive_imports(self):
+        file_path = self._write_files(
+            {"config.yml": "key: !import:key imported.yml\n", "imported.yml": "key: !import:key config.yml\n"}
+        )
+        with self.assertRaises(ConfigueRecursionError):
+            configue.load(file_path, "key", lazy=True)
+
+    def test_load_with_seek_sub_path_and_recursive_references(self):
+        file_path = self._write_files({"config.yml": "first: !cfg second\nsecond:\n  key: !cfg first\n"})
+        with self.assertRaises(ConfigueRecursionError):
+            configue.load(file_path, "first", seek_sub_path=True)
+        file_path = self._write_files(
+            {"config.yml": "key: !import:key imported.yml\n", "imported.yml": "key: !import:key config.yml\n"}
+        )
+        with self.assertRaises(ConfigueRecursionError):
+            configue.load(file_path, "key", seek_sub_path=True)
+
+    def test_load_with_long_chain_of_references(self):
+        chain_length = 3000
+        file_path = self._write_files(
+            {
+                "config.yml": "".join(f"value_{index}: !cfg value_{index + 1}\n" for index in range(chain_length))
+                + f"value_{chain_length}: {{key: value}}\n"
+            }
+        )
+        config = configue.load(file_path)
+        self.assertEqual({"key": "value"}, config["value_0"])
+        self.assertIs(config["value_0"], config[f"value_{chain_length - 1}"])
+
+    def test_load_with_cfg_through_merge_key(self):
+        file_path = self._write_files(
+            {
+                "config.yml": "base: &base {x: 1, y: 1}\nother: &other {z: 3}\n"
+                "first: {<<: *base, y: 2}\nsecond: {<<: [*other, *base]}\n"
+                "x: !cfg first.x\ny: !cfg first.y\nz: !cfg second.z\n"
+            }
+        )
+        config = configue.load(file_path)
+        self.assertEqual({"x": 1, "y": 2}, config["first"])
+        self.assertEqual((1, 2, 3), (config["x"], config["y"], config["z"]))
+        self.assertEqual(1, configue.load(file_path, "first.x", lazy=True))
+        # The merged keys are found in the same way once the mapping is constructed
+        config = configue.Config(file_path)
+        self.assertEqual({"x": 1, "y": 2}, config.get("first"))
+        self.assertEqual(2, config.get("y"))
+
+    def test_load_with_unresolvable_reference(self):
+        file_path = self._write_files({"config.yml": "first: !cfg second.missing\nsecond: {}\n"})
+        with self.assertRaises(configue.exceptions.SubPathNotFound):
+            configue.load(file_path)
+
+    @staticmethod
+    def _get_node(root_loader: RootLoader, file_path: str, sub_path: str) -> Tuple[FileLoader, Node]:
+        node = root_loader.get_node(file_path, sub_path)
+        assert node is not None
+        return node
+
+    def _write_files(self, contents_by_file_name: Dict[str, str]) -> str:
+        for file_name, content in contents_by_file_name.items():
+            self._write_file(file_name, content)
+        return self._get_path(next(iter(contents_by_file_name)))
@@ -0,0 +1,70 @@
+import io
+from typing import Any, List
+
+from yaml import MappingNode, ScalarNode
+from yaml.composer import ComposerError
+
+import configue
+from configue.configue_loader import ConfigueLoader
+from configue.sub_path_seeker import SubPathSeeker
+from tests.temp_dir_test_case import TempDirTestCase
+
+
+class TestSubPathSeeker(TempDirTestCase):
+    def test_seek_composes_node_at_path(self):
+        node, remaining_path = self._seek("key1: value1\nkey2:\n  - item1\n  - subkey: value2\n", ["key2", "1"])
+        self.assertIsInstance(node, MappingNode)
+        self.assertEqual("subkey", node.value[0][0].value)
+        self.assertEqual([], remaining_path)
+
+    def test_seek_skips_complex_keys(self):
+        node, _ = self._seek("? [a, b]\n: value1\nkey: value2\n", ["key"])
+        self.assertEqual("value2", node.value)
+
+    def test_seek_stops_at_scalar_node(self):
+        node, remaining_path = self._seek("key: !ext module.object\n", ["key", "attribute"])
+        self.assertIsInstance(node, ScalarNode)
+        self.assertEqual("!ext", node.tag)
+        self.assertEqual(["attribute"], remaining_path)
+
+    def test_seek_does_not_compose_end_of_document(self):
+        node, _ = self._seek("key1: value1\nkey2: &anchor [item1]\nkey3: *anchor\n", ["key1"])
+        self.assertEqual("value1", node.value)
+
+    def test_seek_returns_none_on_several_documents(self):
+        self.assertIsNone(self._seek("key1: value1\n---\nkey1: value2\n", ["key1"]))
+
+    def test_load_with_seek_sub_path_and_several_documents(self):
+        file_path = self._write_file("config.yml", "key1: value1\n---\nkey1: value2\n")
+        with self.assertRaises(ComposerError):
+            configue.load(file_path, "key1", seek_sub_path=True)
+
+    def test_seek_returns_none_on_alias_to_outside_anchor(self):
+        self.assertIsNone(self._seek("key1: &anchor value1\nkey2:\n  subkey: *anchor\n", ["key2"]))
+
+    def test_seek_composes_alias_to_inside_anchor(self):
+        node, _ = self._seek("key1: value1\nkey2:\n  subkey1: &anchor value2\n  subkey2: *anchor\n", ["key2"])
+        self.assertIs(node.value[0][1], node.value[1][1])
+
+    def test_seek_returns_none_when_path_is_not_found(self):
+        self.assertIsNone(self._seek("key1: value1\n", ["key2"]))
+        self.assertIsNone(self._seek("key1: [item1]\n", ["key1", "1"]))
+        self.assertIsNone(self._seek("key1: [item1]\n", ["key1", "-1"]))
+        self.assertIsNone(self._seek("key1: [item1]\n", ["key1", "item1"]))
+        self.assertIsNone(self._seek("", ["key1"]))
+
+    def test_load_with_seek_sub_path_composes_whole_file_when_needed(self):
+        file_path = self._write_file(
+            "config.yml", "key1: &anchor [item1]\nkey2:\n  subkey1: *anchor\n  subkey2: !cfg key1\n"
+        )
+        result = configue.load(file_path, "key2", seek_sub_path=True)
+        self.assertEqual({"subkey1": ["item1"], "subkey2": ["item1"]}, result)
+        self.assertIs(result["subkey1"], result["subkey2"])
+
+    @staticmethod
+    def _seek(content: str, path: List[str]) -> Any:
+        parser = ConfigueLoader(io.StringIO(content))
+        try:
+            return SubPathSeeker(parser).seek(path)
+        finally:
+            parser.dispose()
@@ -0,0 +1,38 @@
+import threading
+from typing import List
+
+import configue
+from tests.temp_dir_test_case import TempDirTestCase
+
+
+class TestConfigWatcher(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self._file_path = self._write_file("config.yml", "key: value")
+        self._config = configue.Config(self._file_path)
+        self._config.get("key")
+
+    def test_poll_notifies_subscribers(self):
+        notified_files: List[List[str]] = []
+        watcher = configue.ConfigWatcher(self._config)
+        watcher.subscribe(notified_files.append)
+        self.assertEqual([], watcher.poll())
+        self._write_file("config.yml", "key: other_value")
+        self.assertEqual([self._file_path], watcher.poll())
+        self.assertEqual([[self._file_path]], notified_files)
+        self.assertEqual("other_value", self._config.get("key"))
+
+    def test_watcher_reloads_in_background(self):
+        reloaded = threading.Event()
+        with configue.ConfigWatcher(self._config, interval=0.01) as watcher:
+            watcher.subscribe(lambda _: reloaded.set())
+            self._write_file("config.yml", "key: other_value")
+            self.assertTrue(reloaded.wait(5))
+        self.assertEqual("other_value", self._config.get("key"))
+
+    def test_watcher_logs_reload_errors(self):
+        with self.assertLogs("configue.watcher", "ERROR"):
+            with configue.ConfigWatcher(self._config, interval=0.01):
+                self._write_file("config.yml", "key: [")
+                threading.Event().wait(0.1)
+        self.assertEqual("value", self._config.get("key"))